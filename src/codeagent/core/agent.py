@@ -10,6 +10,8 @@ The Agent orchestrates the conversation loop, handling:
 
 import json
 import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Callable, Generator, Optional
 
 from codeagent.core.exceptions import AgentError, MaxIterationsError
@@ -36,6 +38,9 @@ class Agent:
     making it easy to test and configure.
     """
 
+    # Threads for running consecutive read-only tool calls side by side
+    TOOL_WORKERS = max(3, (os.cpu_count() or 1) * 3 // 4)
+
     def __init__(
         self,
         provider: LLMProvider,
@@ -132,8 +137,7 @@ class Agent:
             )
 
             # Execute tools
-            for tool_call in response.tool_calls:
-                result = self._execute_tool(tool_call)
+            for tool_call, result in self._execute_tools(response.tool_calls):
                 self._messages.append(
                     Message.tool_response(
                         tool_call_id=tool_call.id,
@@ -194,8 +198,7 @@ class Agent:
             )
 
             # Execute tools (callbacks handle display)
-            for tool_call in tool_calls:
-                result = self._execute_tool(tool_call)
+            for tool_call, result in self._execute_tools(tool_calls):
                 self._messages.append(
                     Message.tool_response(
                         tool_call_id=tool_call.id,
@@ -220,15 +223,64 @@ class Agent:
 
         yield from self._provider.stream(messages=messages, tools=tools)
 
-    def _execute_tool(self, tool_call: ToolCall) -> ToolResult:
-        """Execute a single tool call."""
-        logger.info(f"Executing tool: {tool_call.name}")
-        logger.debug(f"Tool arguments: {tool_call.arguments}")
+    def _is_read_only(self, tool_call: ToolCall) -> bool:
+        return self._tools.has(tool_call.name) and self._tools.get(
+            tool_call.name
+        ).is_read_only(**tool_call.arguments)
 
+    def _execute_tools(
+        self, tool_calls: list[ToolCall]
+    ) -> Generator[tuple[ToolCall, ToolResult], None, None]:
+        """
+        Execute tool calls, yielding each call with its result in order.
+
+        Consecutive read-only calls are started together on a thread pool.
+        Any other call runs alone, after everything before it has finished,
+        so writes keep the order the model asked for. Callbacks always fire
+        in call order.
+        """
+        i = 0
+        while i < len(tool_calls):
+            batch = [tool_calls[i]]
+            if self._is_read_only(tool_calls[i]):
+                while i + len(batch) < len(tool_calls) and self._is_read_only(
+                    tool_calls[i + len(batch)]
+                ):
+                    batch.append(tool_calls[i + len(batch)])
+            i += len(batch)
+
+            if len(batch) == 1:
+                yield batch[0], self._execute_tool(batch[0])
+                continue
+
+            # A pool per batch, so no worker threads outlive it
+            with ThreadPoolExecutor(
+                max_workers=min(len(batch), self.TOOL_WORKERS), thread_name_prefix="tool"
+            ) as executor:
+                futures = [executor.submit(self._run_tool, tc) for tc in batch]
+                for tool_call, future in zip(batch, futures):
+                    yield tool_call, self._execute_tool(tool_call, future)
+
+    def _execute_tool(
+        self, tool_call: ToolCall, running: Optional["Future[ToolResult]"] = None
+    ) -> ToolResult:
+        """Execute a single tool call, or wait for one already running."""
         # Callback for tool start
         if self._on_tool_start:
             self._on_tool_start(tool_call)
 
+        result = running.result() if running else self._run_tool(tool_call)
+
+        # Callback for tool end
+        if self._on_tool_end:
+            self._on_tool_end(result)
+
+        return result
+
+    def _run_tool(self, tool_call: ToolCall) -> ToolResult:
+        logger.info(f"Executing tool: {tool_call.name}")
+        logger.debug(f"Tool arguments: {tool_call.arguments}")
+
         # Execute the tool
         result = self._tools.execute(
             name=tool_call.name,
@@ -237,11 +289,6 @@ class Agent:
         )
 
         logger.debug(f"Tool result (truncated): {result.content[:200]}")
-
-        # Callback for tool end
-        if self._on_tool_end:
-            self._on_tool_end(result)
-
         return result
 
     def add_message(self, role: Role, content: str) -> None:
@@ -5,6 +5,23 @@ Follows the principle of creating specific exception types
 for different error categories to enable proper error handling.
 """
 
+from typing import Callable
+
+
+class LazyMessage:
+    """Error text that is only built when something reads it."""
+
+    __slots__ = ("_build", "_text")
+
+    def __init__(self, build: Callable[[], str]) -> None:
+        self._build = build
+        self._text: str | None = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self._build()
+        return self._text
+
 
 class CodeAgentError(Exception):
     """Base exception for all CodeAgent errors."""
@@ -70,12 +87,28 @@ class ToolNotFoundError(ToolError):
 
 
 class ToolExecutionError(ToolError):
-    """Raised when a tool execution fails."""
+    """
+    Raised when a tool execution fails.
 
-    def __init__(self, tool_name: str, reason: str) -> None:
-        super().__init__(f"Tool '{tool_name}' failed: {reason}")
+    The reason may be a LazyMessage, in which case it is only formatted when
+    reason, message or str() is first accessed.
+    """
+
+    def __init__(self, tool_name: str, reason: str | LazyMessage) -> None:
+        Exception.__init__(self, tool_name, reason)
         self.tool_name = tool_name
-        self.reason = reason
+        self._reason = reason
+
+    @property
+    def reason(self) -> str:
+        return str(self._reason)
+
+    @property
+    def message(self) -> str:
+        return f"Tool '{self.tool_name}' failed: {self.reason}"
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class AgentError(CodeAgentError):
@@ -3,7 +3,7 @@
 from codeagent.tools.base import Tool, ToolRegistry
 from codeagent.tools.file_read import ReadFileTool
 from codeagent.tools.file_write import WriteFileTool
-from codeagent.tools.file_edit import EditFileTool
+from codeagent.tools.file_edit import BatchEditFileTool, EditFileTool
 from codeagent.tools.file_ops import (
     DeleteFileTool,
     CopyFileTool,
@@ -74,6 +74,7 @@ def create_default_registry() -> ToolRegistry:
     registry.register(ReadFileTool())
     registry.register(WriteFileTool())
     registry.register(EditFileTool())
+    registry.register(BatchEditFileTool())
     registry.register(DeleteFileTool())
     registry.register(CopyFileTool())
     registry.register(MoveFileTool())
@@ -151,6 +152,7 @@ __all__ = [
     "ReadFileTool",
     "WriteFileTool",
     "EditFileTool",
+    "BatchEditFileTool",
     "DeleteFileTool",
     "CopyFileTool",
     "MoveFileTool",
@@ -5,14 +5,37 @@ Implements the Command pattern with a Registry for tool management.
 Tools are self-describing, making it easy to generate schemas for LLMs.
 """
 
+import functools
+import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any, Callable, Optional, TypeVar
 
 from codeagent.core.exceptions import ToolExecutionError, ToolNotFoundError
 from codeagent.core.types import ToolResult
 
 
+@functools.lru_cache(maxsize=256)
+def _join_path(file_path: str, base_dir: str) -> Path:
+    path = Path(file_path).expanduser()
+    return path if path.is_absolute() else Path(base_dir) / path
+
+
+def resolve_path(file_path: str, working_dir: str | None = None) -> Path:
+    """Resolve a tool path argument against working_dir, or the current directory."""
+    return _join_path(file_path, working_dir or os.getcwd())
+
+
+_change_listeners: list[Callable[[], None]] = []
+
+
+def on_workspace_change(listener: Callable[[], None]) -> Callable[[], None]:
+    """Register a callback to run after any tool that may have modified files."""
+    _change_listeners.append(listener)
+    return listener
+
+
 @dataclass(frozen=True)
 class ToolParameter:
     """Definition of a tool parameter."""
@@ -23,6 +46,7 @@ class ToolParameter:
     required: bool = True
     default: Any = None
     enum: Optional[list[Any]] = None
+    items: Optional[dict[str, Any]] = None  # JSON Schema for array elements
 
 
 @dataclass
@@ -45,6 +69,8 @@ class ToolDefinition:
             }
             if param.enum:
                 prop["enum"] = param.enum
+            if param.items:
+                prop["items"] = param.items
 
             properties[param.name] = prop
 
@@ -73,6 +99,11 @@ class Tool(ABC):
     Each tool defines its name, description, parameters, and execution logic.
     """
 
+    # Tools that never modify files or repository state set this, so
+    # on_workspace_change listeners are not run after them (per call, see
+    # is_read_only)
+    read_only: bool = False
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -90,6 +121,14 @@ class Tool(ABC):
         """List of parameters the tool accepts. Override to define parameters."""
         return []
 
+    def is_read_only(self, **kwargs: Any) -> bool:
+        """
+        Whether a call with these arguments leaves files and repository state alone.
+
+        Defaults to read_only. Tools that only sometimes write override this.
+        """
+        return self.read_only
+
     def get_definition(self) -> ToolDefinition:
         """Get the complete tool definition."""
         return ToolDefinition(
@@ -129,6 +168,7 @@ class Tool(ABC):
         Returns:
             ToolResult with success or error information
         """
+        read_only = self.is_read_only(**kwargs)
         try:
             result = self.execute(**kwargs)
             return ToolResult(
@@ -148,6 +188,11 @@ class Tool(ABC):
                 content=f"Unexpected error: {e}",
                 is_error=True,
             )
+        finally:
+            # A failed call may still have changed something, so notify either way
+            if not read_only:
+                for listener in _change_listeners:
+                    listener()
 
 
 class ToolRegistry:
@@ -1,17 +1,49 @@
 """Code analysis tools."""
 
+import io
 import os
 import re
-from pathlib import Path
+import time
+from collections import OrderedDict
 from typing import Any
 
 from codeagent.core.exceptions import ToolExecutionError
-from codeagent.tools.base import Tool, ToolParameter
+from codeagent.tools.base import Tool, ToolParameter, on_workspace_change
+
+
+# Larger source files are assumed to be generated or bundled and are skipped
+MAX_SCAN_FILE_SIZE = 2 * 1024 * 1024
+
+# Number of leading bytes checked for NUL when detecting binary files
+BINARY_SNIFF_SIZE = 512
+
+
+def _is_binary(data: bytes) -> bool:
+    """Check whether file content looks binary (NUL byte near the start)."""
+    return b"\0" in data[:BINARY_SNIFF_SIZE]
+
+
+# Recent find_symbol results: (symbol, root, file_types) -> (root mtime_ns, stored at, result).
+# Cleared after any tool that may have modified files. Edits made outside the
+# agent are not seen by the root mtime when they are in subdirectories, so
+# entries also expire after a TTL.
+_FIND_CACHE: OrderedDict[tuple[str, str, tuple[str, ...] | None], tuple[int, float, str]] = (
+    OrderedDict()
+)
+_FIND_CACHE_SIZE = 64
+_FIND_CACHE_TTL = 30.0
+
+
+@on_workspace_change
+def _clear_find_cache() -> None:
+    _FIND_CACHE.clear()
 
 
 class TreeTool(Tool):
     """Tool for displaying directory structure as a tree."""
 
+    read_only = True
+
     # Directories to ignore by default
     DEFAULT_IGNORE = {
         ".git",
@@ -92,55 +124,82 @@ class TreeTool(Tool):
             if pattern.startswith('*')
         )
 
-    def _build_tree(
+    def _list_dir(self, path: str, show_hidden: bool) -> list[os.DirEntry[str]]:
+        """List visible entries of a directory, directories first."""
+        with os.scandir(path) as it:
+            entries = [e for e in it if not self._should_ignore(e.name, show_hidden)]
+        entries.sort(key=lambda e: (not e.is_dir(), e.name.lower()))
+        return entries
+
+    def _push_dir(
         self,
-        path: Path,
+        stack: list[list[Any]],
+        path: str,
         prefix: str,
         depth: int,
-        max_depth: int,
         show_hidden: bool,
-        file_count: list[int],  # Mutable counter
-    ) -> list[str]:
-        """Recursively build tree structure."""
-        if depth > max_depth or file_count[0] >= self._max_files:
-            return []
-
-        lines: list[str] = []
-
+        out: io.StringIO,
+    ) -> None:
+        """List a directory and push it onto the traversal stack."""
         try:
-            entries = sorted(path.iterdir(), key=lambda e: (not e.is_dir(), e.name.lower()))
+            entries = self._list_dir(path, show_hidden)
         except PermissionError:
-            return [f"{prefix}[permission denied]"]
+            out.write(f"\n{prefix}[permission denied]")
+            return
+        # Frame: entries, index of next entry, line prefix, depth
+        stack.append([entries, 0, prefix, depth])
 
-        # Filter entries
-        entries = [e for e in entries if not self._should_ignore(e.name, show_hidden)]
+    def _build_tree(
+        self,
+        root: str,
+        max_depth: int,
+        show_hidden: bool,
+        out: io.StringIO,
+    ) -> int:
+        """
+        Write the tree below root to out, depth-first.
 
-        for i, entry in enumerate(entries):
-            if file_count[0] >= self._max_files:
-                lines.append(f"{prefix}... (truncated, max files reached)")
-                break
+        Uses an explicit stack instead of recursion, and only lists a
+        directory when both depth and file budget remain.
 
-            file_count[0] += 1
+        Returns:
+            Number of entries written
+        """
+        file_count = 0
+        stack: list[list[Any]] = []
+        if max_depth >= 1 and self._max_files > 0:
+            self._push_dir(stack, root, "", 1, show_hidden, out)
+
+        while stack:
+            frame = stack[-1]
+            entries, i, prefix, depth = frame
+
+            if i == len(entries):
+                stack.pop()
+                continue
+
+            if file_count >= self._max_files:
+                out.write(f"\n{prefix}... (truncated, max files reached)")
+                stack.pop()
+                continue
+
+            frame[1] = i + 1
+            file_count += 1
+            entry = entries[i]
             is_last = i == len(entries) - 1
             connector = "└── " if is_last else "├── "
             extension = "    " if is_last else "│   "
 
             if entry.is_dir():
-                lines.append(f"{prefix}{connector}{entry.name}/")
-                lines.extend(
-                    self._build_tree(
-                        entry,
-                        prefix + extension,
-                        depth + 1,
-                        max_depth,
-                        show_hidden,
-                        file_count,
+                out.write(f"\n{prefix}{connector}{entry.name}/")
+                if depth < max_depth and file_count < self._max_files:
+                    self._push_dir(
+                        stack, entry.path, prefix + extension, depth + 1, show_hidden, out
                     )
-                )
             else:
-                lines.append(f"{prefix}{connector}{entry.name}")
+                out.write(f"\n{prefix}{connector}{entry.name}")
 
-        return lines
+        return file_count
 
     def execute(
         self,
@@ -163,28 +222,27 @@ class TreeTool(Tool):
         """
         # Resolve path
         if working_dir and not os.path.isabs(path):
-            full_path = Path(working_dir) / path
+            full_path = os.path.join(working_dir, path)
         else:
-            full_path = Path(path)
+            full_path = path
 
-        full_path = full_path.resolve()
+        # Absolute path only - symlinks are not resolved, so no per-component stat
+        full_path = os.path.abspath(full_path)
 
-        if not full_path.exists():
+        if not os.path.exists(full_path):
             raise ToolExecutionError(self.name, f"Path does not exist: {path}")
 
-        if not full_path.is_dir():
+        if not os.path.isdir(full_path):
             raise ToolExecutionError(self.name, f"Path is not a directory: {path}")
 
         effective_depth = min(max_depth, 10)
-        file_count = [0]
 
-        lines = [f"{full_path.name}/"]
-        lines.extend(
-            self._build_tree(full_path, "", 1, effective_depth, show_hidden, file_count)
-        )
+        out = io.StringIO()
+        out.write(f"{os.path.basename(full_path)}/")
+        file_count = self._build_tree(full_path, effective_depth, show_hidden, out)
 
-        result = "\n".join(lines)
-        if file_count[0] >= self._max_files:
+        result = out.getvalue()
+        if file_count >= self._max_files:
             result += f"\n\n(Showing {self._max_files} of potentially more entries)"
 
         return result
@@ -193,6 +251,8 @@ class TreeTool(Tool):
 class FindSymbolTool(Tool):
     """Tool for finding function/class definitions in code."""
 
+    read_only = True
+
     # Language-specific patterns for finding definitions
     PATTERNS = {
         ".py": [
@@ -210,16 +270,16 @@ class FindSymbolTool(Tool):
         ".ts": [
             (r"^\s*(async\s+)?function\s+{symbol}\s*[<\(]", "function"),
             (r"^\s*(const|let|var)\s+{symbol}\s*=\s*(async\s+)?\(", "arrow function"),
-            (r"^\s*(export\s+)?class\s+{symbol}\s*[<\{\s]", "class"),
-            (r"^\s*(export\s+)?interface\s+{symbol}\s*[<\{]", "interface"),
+            (r"^\s*(export\s+)?class\s+{symbol}\s*[<\{{\s]", "class"),
+            (r"^\s*(export\s+)?interface\s+{symbol}\s*[<\{{]", "interface"),
             (r"^\s*(export\s+)?type\s+{symbol}\s*[<=]", "type"),
             (r"^\s*(export\s+)?(const|let|var)\s+{symbol}\s*[=:]", "variable"),
         ],
         ".tsx": [
             (r"^\s*(async\s+)?function\s+{symbol}\s*[<\(]", "function"),
             (r"^\s*(const|let|var)\s+{symbol}\s*=\s*(async\s+)?\(", "arrow function"),
-            (r"^\s*(export\s+)?class\s+{symbol}\s*[<\{\s]", "class"),
-            (r"^\s*(export\s+)?interface\s+{symbol}\s*[<\{]", "interface"),
+            (r"^\s*(export\s+)?class\s+{symbol}\s*[<\{{\s]", "class"),
+            (r"^\s*(export\s+)?interface\s+{symbol}\s*[<\{{]", "interface"),
             (r"^\s*(export\s+)?type\s+{symbol}\s*[<=]", "type"),
             (r"^\s*(export\s+)?(const|let|var)\s+{symbol}\s*[=:]", "variable/component"),
         ],
@@ -232,15 +292,15 @@ class FindSymbolTool(Tool):
         ],
         ".rs": [
             (r"^\s*(pub\s+)?fn\s+{symbol}\s*[<\(]", "function"),
-            (r"^\s*(pub\s+)?struct\s+{symbol}\s*[<\{]", "struct"),
-            (r"^\s*(pub\s+)?enum\s+{symbol}\s*[<\{]", "enum"),
-            (r"^\s*(pub\s+)?trait\s+{symbol}\s*[<\{]", "trait"),
+            (r"^\s*(pub\s+)?struct\s+{symbol}\s*[<\{{]", "struct"),
+            (r"^\s*(pub\s+)?enum\s+{symbol}\s*[<\{{]", "enum"),
+            (r"^\s*(pub\s+)?trait\s+{symbol}\s*[<\{{]", "trait"),
             (r"^\s*(pub\s+)?type\s+{symbol}\s*[<=]", "type alias"),
         ],
         ".java": [
             (r"^\s*(public|private|protected)?\s*(static\s+)?\w+\s+{symbol}\s*\(", "method"),
-            (r"^\s*(public|private|protected)?\s*(abstract\s+)?class\s+{symbol}\s*[<\{]", "class"),
-            (r"^\s*(public|private|protected)?\s*interface\s+{symbol}\s*[<\{]", "interface"),
+            (r"^\s*(public|private|protected)?\s*(abstract\s+)?class\s+{symbol}\s*[<\{{]", "class"),
+            (r"^\s*(public|private|protected)?\s*interface\s+{symbol}\s*[<\{{]", "interface"),
             (r"^\s*(public|private|protected)?\s*enum\s+{symbol}\s*\{{", "enum"),
         ],
         ".rb": [
@@ -292,24 +352,60 @@ class FindSymbolTool(Tool):
             ),
         ]
 
-    def _search_file(
+    def _compile_patterns(
         self,
-        file_path: Path,
         symbol: str,
         patterns: list[tuple[str, str]],
+    ) -> list[tuple[re.Pattern[bytes], str]]:
+        """Compile pattern templates for a symbol into byte regexes."""
+        escaped = re.escape(symbol)
+        return [
+            (re.compile(template.format(symbol=escaped).encode("utf-8")), def_type)
+            for template, def_type in patterns
+        ]
+
+    def _search_file(
+        self,
+        file_path: str,
+        symbol: bytes,
+        patterns: list[tuple[re.Pattern[bytes], str]],
     ) -> list[tuple[int, str, str]]:
         """Search a file for symbol definitions."""
-        results = []
+        results: list[tuple[int, str, str]] = []
 
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    for pattern_template, def_type in patterns:
-                        pattern = pattern_template.format(symbol=re.escape(symbol))
-                        if re.match(pattern, line):
-                            results.append((line_num, def_type, line.strip()))
+            with open(file_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size > MAX_SCAN_FILE_SIZE:
+                    return results
+                data = f.read()
         except (OSError, IOError):
-            pass
+            return results
+
+        # Every pattern contains the symbol literally
+        if symbol not in data or _is_binary(data):
+            return results
+
+        # splitlines() also breaks on a lone \r, so make those plain newlines
+        if b"\r" in data:
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+        # Jump between occurrences of the symbol instead of splitting every
+        # line; line numbers are counted only up to the lines that are checked
+        line_num = 1
+        counted = 0
+        pos = data.find(symbol)
+        while pos != -1:
+            start = data.rfind(b"\n", 0, pos) + 1
+            end = data.find(b"\n", pos) + 1 or len(data)
+            line_num += data.count(b"\n", counted, start)
+            counted = start
+            line = data[start:end]
+            for regex, def_type in patterns:
+                if regex.match(line):
+                    results.append(
+                        (line_num, def_type, line.strip().decode("utf-8", errors="ignore"))
+                    )
+            pos = data.find(symbol, end)
 
         return results
 
@@ -334,16 +430,19 @@ class FindSymbolTool(Tool):
         """
         # Resolve path
         if working_dir and not os.path.isabs(path):
-            search_path = Path(working_dir) / path
+            search_path = os.path.join(working_dir, path)
         else:
-            search_path = Path(path)
+            search_path = path
 
-        search_path = search_path.resolve()
+        search_path = os.path.abspath(search_path)
 
-        if not search_path.exists():
+        try:
+            root_mtime = os.stat(search_path).st_mtime_ns
+        except FileNotFoundError:
             raise ToolExecutionError(self.name, f"Path does not exist: {path}")
 
         # Determine which file types to search
+        extensions: list[str] | None = None
         if file_types:
             extensions = [ext.strip() if ext.startswith('.') else f".{ext.strip()}"
                           for ext in file_types.split(',')]
@@ -351,6 +450,21 @@ class FindSymbolTool(Tool):
         else:
             patterns_to_use = self.PATTERNS
 
+        # Repeated identical queries on an unchanged tree are served from the cache
+        cache_key = (symbol, search_path, tuple(extensions) if extensions else None)
+        cached = _FIND_CACHE.get(cache_key)
+        now = time.monotonic()
+        if cached and cached[0] == root_mtime and now - cached[1] < _FIND_CACHE_TTL:
+            _FIND_CACHE.move_to_end(cache_key)
+            return cached[2]
+
+        compiled = {
+            ext: self._compile_patterns(symbol, patterns)
+            for ext, patterns in patterns_to_use.items()
+            if patterns
+        }
+        symbol_bytes = symbol.encode("utf-8")
+
         # Search for the symbol
         findings: list[str] = []
         files_searched = 0
@@ -364,25 +478,30 @@ class FindSymbolTool(Tool):
                 if files_searched >= max_files:
                     break
 
-                ext = Path(filename).suffix
-                if ext not in patterns_to_use or not patterns_to_use[ext]:
+                ext = os.path.splitext(filename)[1]
+                if ext not in compiled:
                     continue
 
                 files_searched += 1
-                file_path = Path(root) / filename
-                results = self._search_file(file_path, symbol, patterns_to_use[ext])
+                file_path = os.path.join(root, filename)
+                results = self._search_file(file_path, symbol_bytes, compiled[ext])
 
                 for line_num, def_type, line_content in results:
-                    rel_path = file_path.relative_to(search_path)
+                    rel_path = os.path.relpath(file_path, search_path)
                     findings.append(
                         f"{rel_path}:{line_num} ({def_type})\n  {line_content}"
                     )
 
         if not findings:
-            return f"No definitions found for '{symbol}' in {search_path}"
+            result = f"No definitions found for '{symbol}' in {search_path}"
+        else:
+            result = f"Found {len(findings)} definition(s) for '{symbol}':\n\n"
+            result += "\n\n".join(findings)
 
-        result = f"Found {len(findings)} definition(s) for '{symbol}':\n\n"
-        result += "\n\n".join(findings)
+        _FIND_CACHE[cache_key] = (root_mtime, now, result)
+        _FIND_CACHE.move_to_end(cache_key)
+        if len(_FIND_CACHE) > _FIND_CACHE_SIZE:
+            _FIND_CACHE.popitem(last=False)
 
         return result
 
@@ -390,6 +509,8 @@ class FindSymbolTool(Tool):
 class CodeStatsTool(Tool):
     """Tool for getting code statistics."""
 
+    read_only = True
+
     # File extensions for different languages
     LANGUAGES = {
         "Python": [".py", ".pyw", ".pyi"],
@@ -446,22 +567,22 @@ class CodeStatsTool(Tool):
             ),
         ]
 
-    def _count_lines(self, file_path: Path) -> tuple[int, int, int]:
-        """Count total, code, and blank lines in a file."""
-        total = 0
-        blank = 0
-        code = 0
-
+    def _count_lines(self, file_path: str) -> tuple[int, int, int] | None:
+        """Count total, code, and blank lines in a file. Returns None for binary files."""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    total += 1
-                    if line.strip():
-                        code += 1
-                    else:
-                        blank += 1
+            with open(file_path, "rb") as f:
+                data = f.read()
         except (OSError, IOError):
-            pass
+            return 0, 0, 0
+
+        if _is_binary(data):
+            return None
+
+        lines = data.splitlines()
+
+        total = len(lines)
+        blank = sum(1 for line in lines if not line.strip())
+        code = total - blank
 
         return total, code, blank
 
@@ -482,16 +603,16 @@ class CodeStatsTool(Tool):
         """
         # Resolve path
         if working_dir and not os.path.isabs(path):
-            analyze_path = Path(working_dir) / path
+            analyze_path = os.path.join(working_dir, path)
         else:
-            analyze_path = Path(path)
+            analyze_path = path
 
-        analyze_path = analyze_path.resolve()
+        analyze_path = os.path.abspath(analyze_path)
 
-        if not analyze_path.exists():
+        if not os.path.exists(analyze_path):
             raise ToolExecutionError(self.name, f"Path does not exist: {path}")
 
-        if not analyze_path.is_dir():
+        if not os.path.isdir(analyze_path):
             raise ToolExecutionError(self.name, f"Path is not a directory: {path}")
 
         # Build extension to language mapping
@@ -513,19 +634,25 @@ class CodeStatsTool(Tool):
             dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
 
             for filename in files:
-                file_path = Path(root) / filename
-                ext = file_path.suffix.lower()
+                file_path = os.path.join(root, filename)
+                ext = os.path.splitext(filename)[1].lower()
 
                 if ext not in ext_to_lang:
                     continue
 
+                size = os.stat(file_path).st_size
+                if size > MAX_SCAN_FILE_SIZE:
+                    continue
+
+                counts = self._count_lines(file_path)
+                if counts is None:
+                    continue
+                lines, code, blank = counts
+
                 lang = ext_to_lang[ext]
                 if lang not in stats:
                     stats[lang] = {"files": 0, "lines": 0, "code": 0, "blank": 0, "size": 0}
 
-                lines, code, blank = self._count_lines(file_path)
-                size = file_path.stat().st_size
-
                 stats[lang]["files"] += 1
                 stats[lang]["lines"] += lines
                 stats[lang]["code"] += code
@@ -543,7 +670,7 @@ class CodeStatsTool(Tool):
 
         # Format output
         result_lines = [
-            f"Code Statistics for: {analyze_path.name}/",
+            f"Code Statistics for: {os.path.basename(analyze_path)}/",
             "=" * 60,
             "",
         ]
@@ -1,5 +1,6 @@
 """Environment variable tools."""
 
+import io
 import os
 from typing import Any, Optional
 
@@ -10,6 +11,12 @@ from codeagent.tools.base import Tool, ToolParameter
 class EnvGetTool(Tool):
     """Tool for getting environment variables."""
 
+    # Substrings (lowercase) that mark a variable as potentially sensitive
+    SENSITIVE_PATTERNS = (
+        "key", "secret", "password", "token", "credential",
+        "auth", "private", "api_key", "apikey",
+    )
+
     @property
     def name(self) -> str:
         return "env_get"
@@ -48,14 +55,10 @@ class EnvGetTool(Tool):
         if name is None:
             # List all environment variables (sorted)
             env_vars = sorted(os.environ.items())
+            sensitive_patterns = self.SENSITIVE_PATTERNS
 
-            # Filter out potentially sensitive variables
-            sensitive_patterns = [
-                "key", "secret", "password", "token", "credential",
-                "auth", "private", "api_key", "apikey"
-            ]
-
-            result_lines = ["Environment Variables:", "=" * 50]
+            buf = io.StringIO()
+            buf.write("Environment Variables:\n" + "=" * 50)
             for key, value in env_vars:
                 # Mask potentially sensitive values
                 key_lower = key.lower()
@@ -65,9 +68,9 @@ class EnvGetTool(Tool):
                     # Truncate very long values
                     display_value = value if len(value) <= 100 else value[:100] + "..."
 
-                result_lines.append(f"{key}={display_value}")
+                buf.write(f"\n{key}={display_value}")
 
-            return "\n".join(result_lines)
+            return buf.getvalue()
         else:
             value = os.environ.get(name)
             if value is None:
@@ -1,11 +1,25 @@
 """File editing tool with search and replace."""
 
 import difflib
+import os
+import re
+import stat
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterator, Optional
 
-from codeagent.core.exceptions import ToolExecutionError
-from codeagent.tools.base import Tool, ToolParameter
+from codeagent.core.exceptions import LazyMessage, ToolExecutionError
+from codeagent.tools.base import Tool, ToolParameter, resolve_path
+from codeagent.tools.file_write import write_atomic
+
+try:
+    import ahocorasick
+except ImportError:  # optional, see the "speedups" extra
+    ahocorasick = None
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # optional, see the "speedups" extra
+    process = None
 
 
 # Global callback for diff display - set by CLI
@@ -24,15 +38,135 @@ def _find_similar_lines(content: str, search: str, max_results: int = 3) -> list
     search_lines = search.split('\n')
     search_first_line = search_lines[0].strip()
 
-    similar = []
-    for i, line in enumerate(content_lines):
-        ratio = difflib.SequenceMatcher(None, line.strip(), search_first_line).ratio()
-        if ratio > 0.6:  # 60% similar
-            similar.append(f"Line {i+1}: {line[:80]}{'...' if len(line) > 80 else ''}")
-        if len(similar) >= max_results:
-            break
+    def format_hit(i: int, line: str) -> str:
+        return f"Line {i+1}: {line[:80]}{'...' if len(line) > 80 else ''}"
 
-    return similar
+    # ratio() is at most 2*min(a, b)/(a + b), so lines outside this length
+    # band can never exceed the 60% threshold and are skipped unscored
+    needle_len = len(search_first_line)
+    min_len = needle_len * 3 / 7
+    max_len = needle_len * 7 / 3
+
+    # A line inside the band that contains the needle always scores above the
+    # threshold, so exact and substring hits are reported first without scoring
+    hits = []
+    for i, line in enumerate(content_lines):
+        # Both tests below need the needle somewhere in the raw line
+        if search_first_line not in line:
+            continue
+        stripped = line.strip()
+        if stripped == search_first_line or (
+            search_first_line in stripped and len(stripped) < max_len
+        ):
+            hits.append(i)
+            if len(hits) >= max_results:
+                return [format_hit(i, content_lines[i]) for i in hits]
+
+    if process is not None:
+        # rapidfuzz scores every line in C++ and returns the best matches;
+        # its ratio() is on the same 2*matches/(a + b) scale as difflib's
+        best = process.extract(
+            search_first_line,
+            [line.strip() for line in content_lines],
+            scorer=fuzz.ratio,
+            score_cutoff=60,
+            limit=max_results + len(hits),
+        )
+        for _, _, i in best:
+            if i not in hits:
+                hits.append(i)
+                if len(hits) >= max_results:
+                    break
+        return [format_hit(i, content_lines[i]) for i in hits]
+
+    # The needle is seq2 so its index is built once and reused for every line
+    matcher = difflib.SequenceMatcher()
+    matcher.set_seq2(search_first_line)
+    for i, line in enumerate(content_lines):
+        # Stripping never lengthens a line, so short raw lines are rejected
+        # before the strip() copy is made
+        if len(line) <= min_len:
+            continue
+        stripped = line.strip()
+        if not min_len < len(stripped) < max_len or search_first_line in stripped:
+            continue
+        matcher.set_seq1(stripped)
+        # quick_ratio() is a cheap upper bound on ratio()
+        if matcher.quick_ratio() <= 0.6:
+            continue
+        if matcher.ratio() > 0.6:  # 60% similar
+            hits.append(i)
+            if len(hits) >= max_results:
+                break
+
+    return [format_hit(i, content_lines[i]) for i in hits]
+
+
+def _not_found_message(content: str, old_string: str) -> str:
+    """Explain a missing old_string, suggesting close matches if there are any."""
+    error_msg = "old_string not found in file."
+
+    # Check for common issues first; both are single C-level scans, far
+    # cheaper than the fuzzy line search
+    if old_string.strip() in content:
+        return error_msg + "\n\nThe text exists but whitespace doesn't match. Check indentation."
+    if old_string.replace('\n', '') in content.replace('\n', ''):
+        return error_msg + "\n\nThe text exists but line breaks don't match."
+
+    # Try to find similar lines to help debug
+    similar = _find_similar_lines(content, old_string)
+    if similar:
+        error_msg += "\n\nDid you mean one of these?\n" + "\n".join(similar)
+
+    return error_msg
+
+
+def _ambiguous_message(parts: list[bytes], old_string: str) -> str:
+    """List the lines of every occurrence, given the file bytes split on old_string."""
+    # Find locations of each occurrence from the text between matches
+    occurrences = []
+    old_newlines = old_string.count('\n')
+    line_num = 1
+    for part in parts[:-1]:
+        line_num += part.count(b'\n')
+        occurrences.append(f"Line {line_num}")
+        line_num += old_newlines
+
+    return (
+        f"old_string appears {len(parts) - 1} times at: {', '.join(occurrences)}. "
+        f"Use replace_all=true or include more context to make it unique."
+    )
+
+
+def _encode_arg(tool_name: str, label: str, value: str) -> bytes:
+    """Encode a string argument as UTF-8, rejecting text that cannot be written."""
+    try:
+        return value.encode("utf-8")
+    except UnicodeEncodeError as e:
+        raise ToolExecutionError(tool_name, f"{label} is not valid Unicode text: {e.reason}")
+
+
+def _scan_matches(text: str, needles: list[str]) -> Iterator[tuple[int, int, int]]:
+    """
+    Yield (start, end, needle index) for matches of any needle in one pass.
+
+    Matches are leftmost-longest and never overlap. An Aho-Corasick automaton
+    is used when pyahocorasick is installed, otherwise a regex alternation
+    with longer needles tried first.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for i, needle in enumerate(needles):
+            automaton.add_word(needle, i)
+        automaton.make_automaton()
+        for end, i in automaton.iter_long(text):
+            yield end + 1 - len(needles[i]), end + 1, i
+        return
+
+    index = {needle: i for i, needle in enumerate(needles)}
+    pattern = re.compile("|".join(map(re.escape, sorted(needles, key=len, reverse=True))))
+    for match in pattern.finditer(text):
+        yield match.start(), match.end(), index[match.group()]
 
 
 class EditFileTool(Tool):
@@ -81,6 +215,67 @@ class EditFileTool(Tool):
             ),
         ]
 
+    def _read_content(self, path: Path, file_path: str) -> bytes:
+        """Read the file to edit as bytes with line endings folded to LF."""
+        # One stat answers both the existence and the regular-file check
+        try:
+            is_file = stat.S_ISREG(os.stat(path).st_mode)
+        except (FileNotFoundError, NotADirectoryError):
+            raise ToolExecutionError(
+                self.name,
+                f"File not found: {file_path}",
+            )
+
+        if not is_file:
+            raise ToolExecutionError(
+                self.name,
+                f"Not a file: {file_path}",
+            )
+
+        try:
+            data = path.read_bytes()
+        except PermissionError:
+            raise ToolExecutionError(
+                self.name,
+                f"Permission denied reading: {file_path}",
+            )
+        except Exception as e:
+            raise ToolExecutionError(
+                self.name,
+                f"Failed to read file: {e}",
+            )
+
+        if b"\r" in data:
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        return data
+
+    def _write_content(self, path: Path, file_path: str, old_data: bytes, new_data: bytes) -> None:
+        """Show the diff if a callback is set, then write the new content."""
+        # Display diff if callback is set
+        if _diff_callback:
+            try:
+                _diff_callback(
+                    str(path),
+                    old_data.decode("utf-8", errors="replace"),
+                    new_data.decode("utf-8", errors="replace"),
+                )
+            except Exception:
+                pass  # Don't fail on diff display errors
+
+        # Write back
+        try:
+            write_atomic(path, new_data)
+        except PermissionError:
+            raise ToolExecutionError(
+                self.name,
+                f"Permission denied writing: {file_path}",
+            )
+        except Exception as e:
+            raise ToolExecutionError(
+                self.name,
+                f"Failed to write file: {e}",
+            )
+
     def execute(
         self,
         file_path: str,
@@ -103,79 +298,45 @@ class EditFileTool(Tool):
         Returns:
             Success message with replacement count
         """
-        path = Path(file_path).expanduser()
+        path = resolve_path(file_path, working_dir)
 
-        # Resolve relative paths against working directory
-        if not path.is_absolute():
-            if working_dir:
-                path = Path(working_dir) / path
-            else:
-                path = Path.cwd() / path
+        if not old_string:
+            raise ToolExecutionError(self.name, "old_string must not be empty.")
 
-        if not path.exists():
-            raise ToolExecutionError(
-                self.name,
-                f"File not found: {file_path}",
-            )
+        # Matching runs on the raw bytes; text is only decoded for the diff
+        # callback and for error details
+        data = self._read_content(path, file_path)
 
-        if not path.is_file():
-            raise ToolExecutionError(
-                self.name,
-                f"Not a file: {file_path}",
-            )
+        old_bytes = _encode_arg(self.name, "old_string", old_string)
+        new_bytes = _encode_arg(self.name, "new_string", new_string)
 
-        # Read current content
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except PermissionError:
-            raise ToolExecutionError(
-                self.name,
-                f"Permission denied reading: {file_path}",
-            )
-        except Exception as e:
+        new_data = None
+        if replace_all and old_bytes != new_bytes:
+            # replace() is the only full scan; the count follows from the size change
+            new_data = data.replace(old_bytes, new_bytes)
+            size_delta = len(new_bytes) - len(old_bytes)
+            if size_delta:
+                count = (len(new_data) - len(data)) // size_delta
+            else:
+                count = data.count(old_bytes) if new_data != data else 0
+        else:
+            # One split finds, counts and delimits every occurrence
+            parts = data.split(old_bytes)
+            count = len(parts) - 1
+
+        # Check if old_string exists
+        if not count:
             raise ToolExecutionError(
                 self.name,
-                f"Failed to read file: {e}",
+                LazyMessage(
+                    lambda: _not_found_message(data.decode("utf-8", errors="replace"), old_string)
+                ),
             )
 
-        # Check if old_string exists
-        if old_string not in content:
-            # Try to find similar lines to help debug
-            similar = _find_similar_lines(content, old_string)
-
-            error_msg = "old_string not found in file."
-
-            if similar:
-                error_msg += "\n\nDid you mean one of these?\n" + "\n".join(similar)
-            else:
-                # Check for common issues
-                if old_string.strip() in content:
-                    error_msg += "\n\nThe text exists but whitespace doesn't match. Check indentation."
-                elif old_string.replace('\n', '') in content.replace('\n', ''):
-                    error_msg += "\n\nThe text exists but line breaks don't match."
-
-            raise ToolExecutionError(self.name, error_msg)
-
-        # Count occurrences
-        count = content.count(old_string)
-
         # Validate uniqueness if not replace_all
         if not replace_all and count > 1:
-            # Find locations of each occurrence
-            lines = content.split('\n')
-            occurrences = []
-            search_pos = 0
-            for i in range(count):
-                pos = content.find(old_string, search_pos)
-                line_num = content[:pos].count('\n') + 1
-                occurrences.append(f"Line {line_num}")
-                search_pos = pos + 1
-
             raise ToolExecutionError(
-                self.name,
-                f"old_string appears {count} times at: {', '.join(occurrences)}. "
-                f"Use replace_all=true or include more context to make it unique.",
+                self.name, LazyMessage(lambda: _ambiguous_message(parts, old_string))
             )
 
         # Check for no-op
@@ -186,32 +347,10 @@ class EditFileTool(Tool):
             )
 
         # Perform replacement
-        if replace_all:
-            new_content = content.replace(old_string, new_string)
-        else:
-            new_content = content.replace(old_string, new_string, 1)
+        if new_data is None:
+            new_data = parts[0] + new_bytes + parts[1]
 
-        # Display diff if callback is set
-        if _diff_callback:
-            try:
-                _diff_callback(str(path), content, new_content)
-            except Exception:
-                pass  # Don't fail on diff display errors
-
-        # Write back
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(new_content)
-        except PermissionError:
-            raise ToolExecutionError(
-                self.name,
-                f"Permission denied writing: {file_path}",
-            )
-        except Exception as e:
-            raise ToolExecutionError(
-                self.name,
-                f"Failed to write file: {e}",
-            )
+        self._write_content(path, file_path, data, new_data)
 
         # Calculate diff stats
         old_lines = old_string.count('\n') + 1
@@ -224,3 +363,171 @@ class EditFileTool(Tool):
             return f"Replaced {count} occurrence(s) in {file_path}{diff_str}"
         else:
             return f"Edited {file_path}{diff_str}"
+
+
+def _batch_error_message(
+    data: bytes,
+    text: str,
+    parsed: list[tuple[str, str, bool]],
+    starts: list[list[int]],
+    failed: list[int],
+) -> str:
+    """Describe every edit of a batch that did not match exactly as requested."""
+    messages = []
+    for i in failed:
+        old_string = parsed[i][0]
+        if not starts[i] and old_string in text:
+            detail = "old_string overlaps the match of another edit. Combine them into one edit."
+        elif not starts[i]:
+            detail = _not_found_message(data.decode("utf-8", errors="replace"), old_string)
+        else:
+            # Starts are ascending, so newlines are counted incrementally
+            lines = []
+            line_num = 1
+            last = 0
+            for start in starts[i]:
+                line_num += text.count("\n", last, start)
+                lines.append(f"Line {line_num}")
+                last = start
+            detail = (
+                f"old_string appears {len(lines)} times at: {', '.join(lines)}. "
+                f"Set replace_all or include more context to make it unique."
+            )
+        messages.append(f"Edit {i + 1}: {detail}")
+    return "No changes made.\n\n" + "\n\n".join(messages)
+
+
+class BatchEditFileTool(EditFileTool):
+    """Tool for applying several search and replace edits to one file at once."""
+
+    @property
+    def name(self) -> str:
+        return "batch_edit"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Apply several edits to one file in a single call. Each edit replaces an exact "
+            "old_string with new_string, as in edit_file. All edits are matched against the "
+            "original content and must not overlap. Nothing is written unless every edit "
+            "applies. Prefer this over repeated edit_file calls on the same file."
+        )
+
+    @property
+    def parameters(self) -> list[ToolParameter]:
+        return [
+            ToolParameter(
+                name="file_path",
+                type="string",
+                description="Absolute path to the file to edit",
+                required=True,
+            ),
+            ToolParameter(
+                name="edits",
+                type="array",
+                description=(
+                    "Edits to apply, each with old_string, new_string and optional "
+                    "replace_all (default false, old_string must then be unique)"
+                ),
+                required=True,
+                items={
+                    "type": "object",
+                    "properties": {
+                        "old_string": {"type": "string"},
+                        "new_string": {"type": "string"},
+                        "replace_all": {"type": "boolean"},
+                    },
+                    "required": ["old_string", "new_string"],
+                },
+            ),
+        ]
+
+    def _parse_edits(self, edits: Any) -> list[tuple[str, str, bool]]:
+        """Validate the edits argument into (old_string, new_string, replace_all) tuples."""
+        if not isinstance(edits, list) or not edits:
+            raise ToolExecutionError(self.name, "edits must be a non-empty list.")
+
+        parsed = []
+        seen = set()
+        for n, edit in enumerate(edits, 1):
+            if not isinstance(edit, dict):
+                raise ToolExecutionError(self.name, f"Edit {n}: expected an object.")
+            old_string = edit.get("old_string")
+            new_string = edit.get("new_string")
+            if not isinstance(old_string, str) or not isinstance(new_string, str):
+                raise ToolExecutionError(
+                    self.name, f"Edit {n}: old_string and new_string must be strings."
+                )
+            if not old_string:
+                raise ToolExecutionError(self.name, f"Edit {n}: old_string must not be empty.")
+            if old_string == new_string:
+                raise ToolExecutionError(
+                    self.name, f"Edit {n}: old_string and new_string are identical."
+                )
+            if old_string in seen:
+                raise ToolExecutionError(
+                    self.name, f"Edit {n}: old_string is repeated from an earlier edit."
+                )
+            # Validate here: the batch text is encoded with surrogateescape,
+            # which would silently turn lone surrogates into raw bytes
+            _encode_arg(self.name, f"Edit {n}: old_string", old_string)
+            _encode_arg(self.name, f"Edit {n}: new_string", new_string)
+            seen.add(old_string)
+            parsed.append((old_string, new_string, bool(edit.get("replace_all", False))))
+        return parsed
+
+    def execute(  # type: ignore[override]
+        self,
+        file_path: str,
+        edits: list[dict[str, Any]],
+        working_dir: str | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Apply all edits to a file with a single scan and a single write.
+
+        Args:
+            file_path: Path to the file
+            edits: List of {old_string, new_string, replace_all} objects
+            working_dir: Working directory for resolving relative paths
+
+        Returns:
+            Success message with edit and replacement counts
+        """
+        parsed = self._parse_edits(edits)
+        if len(parsed) == 1:
+            old_string, new_string, replace_all = parsed[0]
+            return super().execute(file_path, old_string, new_string, replace_all, working_dir)
+
+        path = resolve_path(file_path, working_dir)
+        data = self._read_content(path, file_path)
+        # surrogateescape round-trips bytes that are not valid UTF-8
+        text = data.decode("utf-8", errors="surrogateescape")
+
+        counts = [0] * len(parsed)
+        starts: list[list[int]] = [[] for _ in parsed]
+        pieces = []
+        last = 0
+        for start, end, i in _scan_matches(text, [old for old, _, _ in parsed]):
+            counts[i] += 1
+            starts[i].append(start)
+            pieces.append(text[last:start])
+            pieces.append(parsed[i][1])
+            last = end
+        pieces.append(text[last:])
+
+        failed = [
+            i for i, (_, _, replace_all) in enumerate(parsed)
+            if not counts[i] or (not replace_all and counts[i] > 1)
+        ]
+        if failed:
+            raise ToolExecutionError(
+                self.name,
+                LazyMessage(lambda: _batch_error_message(data, text, parsed, starts, failed)),
+            )
+
+        new_data = "".join(pieces).encode("utf-8", errors="surrogateescape")
+        self._write_content(path, file_path, data, new_data)
+
+        return f"Applied {len(parsed)} edit(s) to {file_path} ({sum(counts)} replacement(s))"
+
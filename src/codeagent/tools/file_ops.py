@@ -1,12 +1,28 @@
 """File operation tools - delete, copy, move, mkdir."""
 
+import errno
 import os
 import shutil
-from pathlib import Path
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
 from codeagent.core.exceptions import ToolExecutionError
-from codeagent.tools.base import Tool, ToolParameter
+from codeagent.tools.base import Tool, ToolParameter, resolve_path
+
+
+def _format_size(size: int) -> str:
+    """Format a byte count the way ListDirTool shows it (B, KB or MB)."""
+    if size < 1 << 10:
+        return f"{size}B"
+    if size < 1 << 20:
+        return f"{size >> 10}KB"
+    return f"{size >> 20}MB"
 
 
 class DeleteFileTool(Tool):
@@ -42,14 +58,7 @@ class DeleteFileTool(Tool):
 
     def execute(self, path: str, recursive: bool = False, working_dir: str | None = None, **kwargs: Any) -> str:
         """Delete a file or directory."""
-        target = Path(path).expanduser()
-
-        # Resolve relative paths against working directory
-        if not target.is_absolute():
-            if working_dir:
-                target = Path(working_dir) / target
-            else:
-                target = Path.cwd() / target
+        target = resolve_path(path, working_dir)
 
         if not target.exists():
             raise ToolExecutionError(self.name, f"Path does not exist: {path}")
@@ -80,9 +89,84 @@ class DeleteFileTool(Tool):
             raise ToolExecutionError(self.name, f"Failed to delete: {e}")
 
 
+# Linux ioctl that clones a file's extents (btrfs, XFS, bcachefs, ...)
+_FICLONE = 0x40049409
+_CLONE_SUPPORTED = fcntl is not None and sys.platform.startswith("linux")
+
+# Filesystems (by st_dev) that rejected FICLONE, so it is not retried per file
+_no_clone_devices: set[int] = set()
+
+
+def _clone_file(src: str, dst: str) -> bool:
+    """Try to make dst a copy-on-write clone of src. Returns False if not possible."""
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        src_stat = os.fstat(src_fd)
+        try:
+            if os.path.samestat(src_stat, os.stat(dst)):
+                return False  # let copy2 raise SameFileError
+        except FileNotFoundError:
+            pass
+
+        dst_dev = os.stat(os.path.dirname(dst) or ".").st_dev
+        if dst_dev != src_stat.st_dev or dst_dev in _no_clone_devices:
+            return False
+
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+            return True
+        except OSError as e:
+            if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EXDEV):
+                _no_clone_devices.add(dst_dev)
+            return False
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _copy_file(src: str, dst: str) -> None:
+    """Copy a file like shutil.copy2, as a reflink clone where the filesystem allows."""
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    if _CLONE_SUPPORTED and _clone_file(src, dst):
+        shutil.copystat(src, dst)
+        return
+    shutil.copy2(src, dst)
+
+
+def _copy_tree(src: str, dst: str, max_workers: int) -> None:
+    """
+    Copy a directory tree like shutil.copytree, with files copied concurrently.
+
+    Directories are created in walk order. Their metadata is copied last, so
+    the file copies do not disturb directory mtimes.
+    """
+    dirs = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = []
+        for root, _, filenames in os.walk(src, followlinks=True):
+            target = dst if root == src else os.path.join(dst, os.path.relpath(root, src))
+            os.makedirs(target)
+            dirs.append((root, target))
+            for name in filenames:
+                futures.append(
+                    pool.submit(_copy_file, os.path.join(root, name), os.path.join(target, name))
+                )
+        for future in futures:
+            future.result()
+
+    for root, target in reversed(dirs):
+        shutil.copystat(root, target)
+
+
 class CopyFileTool(Tool):
     """Tool for copying files and directories."""
 
+    # Copies are I/O bound, so use more threads than cores
+    COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
     @property
     def name(self) -> str:
         return "copy"
@@ -110,20 +194,8 @@ class CopyFileTool(Tool):
 
     def execute(self, source: str, destination: str, working_dir: str | None = None, **kwargs: Any) -> str:
         """Copy a file or directory."""
-        src = Path(source).expanduser()
-        dst = Path(destination).expanduser()
-
-        # Resolve relative paths against working directory
-        if not src.is_absolute():
-            if working_dir:
-                src = Path(working_dir) / src
-            else:
-                src = Path.cwd() / src
-        if not dst.is_absolute():
-            if working_dir:
-                dst = Path(working_dir) / dst
-            else:
-                dst = Path.cwd() / dst
+        src = resolve_path(source, working_dir)
+        dst = resolve_path(destination, working_dir)
 
         if not src.exists():
             raise ToolExecutionError(self.name, f"Source does not exist: {source}")
@@ -132,10 +204,10 @@ class CopyFileTool(Tool):
             if src.is_file():
                 # Create parent directories if needed
                 dst.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, dst)
+                _copy_file(str(src), str(dst))
                 return f"Copied file: {source} -> {destination}"
             elif src.is_dir():
-                shutil.copytree(src, dst)
+                _copy_tree(str(src), str(dst), self.COPY_WORKERS)
                 return f"Copied directory: {source} -> {destination}"
             else:
                 raise ToolExecutionError(self.name, f"Unknown file type: {source}")
@@ -177,20 +249,8 @@ class MoveFileTool(Tool):
 
     def execute(self, source: str, destination: str, working_dir: str | None = None, **kwargs: Any) -> str:
         """Move a file or directory."""
-        src = Path(source).expanduser()
-        dst = Path(destination).expanduser()
-
-        # Resolve relative paths against working directory
-        if not src.is_absolute():
-            if working_dir:
-                src = Path(working_dir) / src
-            else:
-                src = Path.cwd() / src
-        if not dst.is_absolute():
-            if working_dir:
-                dst = Path(working_dir) / dst
-            else:
-                dst = Path.cwd() / dst
+        src = resolve_path(source, working_dir)
+        dst = resolve_path(destination, working_dir)
 
         if not src.exists():
             raise ToolExecutionError(self.name, f"Source does not exist: {source}")
@@ -230,14 +290,7 @@ class MkdirTool(Tool):
 
     def execute(self, path: str, working_dir: str | None = None, **kwargs: Any) -> str:
         """Create a directory."""
-        target = Path(path).expanduser()
-
-        # Resolve relative paths against working directory
-        if not target.is_absolute():
-            if working_dir:
-                target = Path(working_dir) / target
-            else:
-                target = Path.cwd() / target
+        target = resolve_path(path, working_dir)
 
         if target.exists():
             if target.is_dir():
@@ -257,6 +310,8 @@ class MkdirTool(Tool):
 class ListDirTool(Tool):
     """Tool for listing directory contents."""
 
+    read_only = True
+
     @property
     def name(self) -> str:
         return "ls"
@@ -284,24 +339,25 @@ class ListDirTool(Tool):
 
     def execute(self, path: str, all: bool = False, working_dir: str | None = None, **kwargs: Any) -> str:
         """List directory contents."""
-        target = Path(path).expanduser()
-
-        # Resolve relative paths against working directory
-        if not target.is_absolute():
-            if working_dir:
-                target = Path(working_dir) / target
-            else:
-                target = Path.cwd() / target
+        target = resolve_path(path, working_dir)
 
-        if not target.exists():
+        try:
+            # DirEntry caches the type from the directory read, so only
+            # regular files cost a stat() for their size
+            with os.scandir(target) as it:
+                items = sorted(it, key=lambda e: e.name)
+        except FileNotFoundError:
             raise ToolExecutionError(self.name, f"Path does not exist: {path}")
-
-        if not target.is_dir():
+        except NotADirectoryError:
             raise ToolExecutionError(self.name, f"Path is not a directory: {path}")
+        except PermissionError:
+            raise ToolExecutionError(self.name, f"Permission denied: {path}")
+        except Exception as e:
+            raise ToolExecutionError(self.name, f"Failed to list directory: {e}")
 
         try:
             entries = []
-            for item in sorted(target.iterdir()):
+            for item in items:
                 # Skip hidden files unless all=True
                 if not all and item.name.startswith("."):
                     continue
@@ -309,14 +365,7 @@ class ListDirTool(Tool):
                 if item.is_dir():
                     entries.append(f"  {item.name}/")
                 else:
-                    size = item.stat().st_size
-                    if size < 1024:
-                        size_str = f"{size}B"
-                    elif size < 1024 * 1024:
-                        size_str = f"{size // 1024}KB"
-                    else:
-                        size_str = f"{size // (1024 * 1024)}MB"
-                    entries.append(f"  {item.name} ({size_str})")
+                    entries.append(f"  {item.name} ({_format_size(item.stat().st_size)})")
 
             if not entries:
                 return f"Directory is empty: {path}"
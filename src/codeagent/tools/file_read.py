@@ -1,16 +1,18 @@
 """File reading tool."""
 
 import os
-from pathlib import Path
+import stat
 from typing import Any
 
 from codeagent.core.exceptions import ToolExecutionError
-from codeagent.tools.base import Tool, ToolParameter
+from codeagent.tools.base import Tool, ToolParameter, resolve_path
 
 
 class ReadFileTool(Tool):
     """Tool for reading file contents."""
 
+    read_only = True
+
     @property
     def name(self) -> str:
         return "read_file"
@@ -67,30 +69,25 @@ class ReadFileTool(Tool):
         Returns:
             File contents with line numbers
         """
-        path = Path(file_path).expanduser()
-
-        # Resolve relative paths against working directory
-        if not path.is_absolute():
-            if working_dir:
-                path = Path(working_dir) / path
-            else:
-                path = Path.cwd() / path
+        path = resolve_path(file_path, working_dir)
 
-        if not path.exists():
+        # One stat answers both the existence and the regular-file check
+        try:
+            is_file = stat.S_ISREG(os.stat(path).st_mode)
+        except (FileNotFoundError, NotADirectoryError):
             raise ToolExecutionError(
                 self.name,
                 f"File not found: {file_path}",
             )
 
-        if not path.is_file():
+        if not is_file:
             raise ToolExecutionError(
                 self.name,
                 f"Not a file: {file_path}",
             )
 
         try:
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
-                lines = f.readlines()
+            text = path.read_bytes().decode("utf-8", errors="replace")
         except PermissionError:
             raise ToolExecutionError(
                 self.name,
@@ -102,18 +99,25 @@ class ReadFileTool(Tool):
                 f"Failed to read file: {e}",
             )
 
+        # Same universal-newline handling as text mode, without TextIOWrapper
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        lines = text.split("\n")
+        if not lines[-1]:
+            lines.pop()
+
         # Apply offset and limit
         total_lines = len(lines)
         lines = lines[offset : offset + limit]
 
-        # Format with line numbers
+        # Format with line numbers, keeping trailing whitespace as in the file
         numbered_lines = []
-        for i, line in enumerate(lines):
-            line_num = offset + i + 1  # 1-indexed line numbers
+        append = numbered_lines.append
+        for line_num, line in enumerate(lines, offset + 1):  # 1-indexed line numbers
             # Truncate very long lines
             if len(line) > 2000:
-                line = line[:2000] + "... (truncated)\n"
-            numbered_lines.append(f"{line_num:6d}\t{line.rstrip()}")
+                line = line[:2000] + "... (truncated)"
+            append(f"{line_num:6d}\t{line}")
 
         result = "\n".join(numbered_lines)
 
@@ -1,11 +1,12 @@
 """File writing tool."""
 
 import os
+import tempfile
 from pathlib import Path
 from typing import Any, Callable, Optional
 
 from codeagent.core.exceptions import ToolExecutionError
-from codeagent.tools.base import Tool, ToolParameter
+from codeagent.tools.base import Tool, ToolParameter, resolve_path
 
 
 # Global callback for diff display - set by CLI
@@ -18,6 +19,40 @@ def set_diff_callback(callback: Optional[Callable[[str, Optional[str], str], Non
     _diff_callback = callback
 
 
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Replace an existing file with data via a temp file and os.replace().
+
+    Readers never see a half-written file and a crash leaves the old content
+    intact. The file's permission bits are kept and symlinks are written
+    through. New files, and directories where no temp file can be created,
+    are written in place.
+    """
+    target = os.path.realpath(path)
+    try:
+        mode = os.stat(target).st_mode & 0o7777
+        fd, tmp = tempfile.mkstemp(
+            dir=os.path.dirname(target), prefix=f".{os.path.basename(target)}.", suffix=".tmp"
+        )
+    except OSError:
+        Path(target).write_bytes(data)
+        return
+
+    try:
+        with open(fd, "wb") as f:
+            os.fchmod(fd, mode)
+            f.write(data)
+            f.flush()
+            os.fsync(fd)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 class WriteFileTool(Tool):
     """Tool for creating or overwriting files."""
 
@@ -67,14 +102,7 @@ class WriteFileTool(Tool):
         Returns:
             Success message
         """
-        path = Path(file_path).expanduser()
-
-        # Resolve relative paths against working directory
-        if not path.is_absolute():
-            if working_dir:
-                path = Path(working_dir) / path
-            else:
-                path = Path.cwd() / path
+        path = resolve_path(file_path, working_dir)
 
         # Check if parent directory exists
         if not path.parent.exists():
@@ -93,28 +121,26 @@ class WriteFileTool(Tool):
         try:
             is_new = not path.exists()
 
-            # Read old content for diff display
-            old_content = None
-            if not is_new:
-                try:
-                    with open(path, "r", encoding="utf-8") as f:
-                        old_content = f.read()
-                except Exception:
-                    pass
-
-            # Display diff if callback is set
+            # Display diff if callback is set; old content is only read for it
             if _diff_callback:
+                old_content = None
+                if not is_new:
+                    try:
+                        old_content = path.read_bytes().decode("utf-8")
+                    except Exception:
+                        pass
                 try:
                     _diff_callback(str(path), old_content, content)
                 except Exception:
                     pass  # Don't fail on diff display errors
 
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(content)
+            # Encode once and hand the whole payload to a single write()
+            data = content.encode("utf-8")
+            write_atomic(path, data)
 
             action = "Created" if is_new else "Wrote"
             lines = content.count("\n") + (1 if content and not content.endswith("\n") else 0)
-            return f"{action} {file_path} ({lines} lines, {len(content)} bytes)"
+            return f"{action} {file_path} ({lines} lines, {len(data)} bytes)"
 
         except PermissionError:
             raise ToolExecutionError(
@@ -1,33 +1,572 @@
 """Git tools for version control operations."""
 
+import atexit
+import functools
+import os
+import shlex
+import shutil
 import subprocess
-from pathlib import Path
-from typing import Any, Optional
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import IO, Any, Optional, Sequence
 
 from codeagent.core.exceptions import ToolExecutionError
-from codeagent.tools.base import Tool, ToolParameter
-
-
-def _run_git(args: list[str], cwd: Optional[str] = None, timeout: int = 30) -> tuple[str, str, int]:
-    """Run a git command and return stdout, stderr, returncode."""
+from codeagent.tools.base import Tool, ToolParameter, on_workspace_change
+
+
+# No optional index lock for reads, so the agent never contends with an
+# editor's git integration; untranslated messages for error matching; and
+# missing credentials fail at once instead of prompting on a terminal the
+# agent's console owns, which left pull/push waiting out their timeout
+_GIT_ENV_OVERRIDES = {"GIT_OPTIONAL_LOCKS": "0", "LC_ALL": "C", "GIT_TERMINAL_PROMPT": "0"}
+
+# Fixed argument lists, built once and passed to git as-is
+_CAT_FILE_ARGS = ("cat-file", "--batch-check")
+_STATUS_ARGS = ("status", "--porcelain=v2", "--branch", "--untracked-files=normal")
+_STAGED_CHECK_ARGS = ("diff", "--cached", "--quiet")
+_BRANCH_LIST_ARGS = (
+    "branch",
+    "--list",
+    "--all",
+    "--format=%(HEAD) %(refname:short) %(objectname:short)",  # "* main 1a2b3c4"
+)
+# "v1.0<TAB>1a2b3c4<TAB>2024-01-31", with annotated tags peeled to their commit
+_TAG_LIST_ARGS = (
+    "for-each-ref",
+    "--format=%(refname:short)%09"
+    "%(if)%(*objectname)%(then)%(*objectname:short)%(else)%(objectname:short)%(end)%09"
+    "%(creatordate:short)",
+    "refs/tags",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _git_executable() -> str:
+    """Absolute path of git, looked up on PATH once."""
+    exe = shutil.which("git")
+    if exe is None:
+        raise ToolExecutionError("git", "Git is not installed or not in PATH")
+    return exe
+
+
+@functools.lru_cache(maxsize=None)
+def _git_version() -> tuple[int, ...]:
+    """Installed git version, e.g. (2, 39, 5); (0,) if it cannot be parsed."""
+    out = subprocess.run(
+        [_git_executable(), "--version"], capture_output=True, env=_git_env()
+    ).stdout
+    # "git version 2.39.5" or "git version 2.39.5.windows.1"
+    parts = out.split()[2].split(b".") if len(out.split()) > 2 else []
+    numbers = tuple(int(p) for p in parts[:3] if p.isdigit())
+    return numbers or (0,)
+
+
+def _git_command(args: Sequence[str], cwd: Optional[str] = None) -> list[str]:
+    """
+    argv for running git in cwd, via `git -C` rather than a chdir in the child.
+
+    A cwd that does not exist is then reported by git itself; a failed
+    chdir would surface as FileNotFoundError, indistinguishable from git
+    not being installed. "." needs no -C at all.
+    """
+    if cwd in (None, ".", ""):
+        return [_git_executable(), *args]
+    return [_git_executable(), "-C", os.fspath(cwd), *args]
+
+
+def _git_env() -> dict[str, str]:
+    # Built per call, since env_set and env_load change os.environ at runtime
+    return {**os.environ, **_GIT_ENV_OVERRIDES}
+
+
+def _run_git(
+    args: Sequence[str],
+    cwd: Optional[str] = None,
+    timeout: int = 30,
+    input: Optional[bytes] = None,
+    env: Optional[dict[str, str]] = None,
+) -> tuple[bytes, bytes, int]:
+    """
+    Run a git command and return raw stdout, stderr, returncode.
+
+    Trailing newlines are removed from both streams here, once, so callers
+    can test and return the output as is.
+    """
     try:
         result = subprocess.run(
-            ["git"] + args,
-            cwd=cwd,
+            _git_command(args, cwd),
+            env=_git_env() if env is None else {**_git_env(), **env},
+            input=input,
             capture_output=True,
-            text=True,
             timeout=timeout,
         )
-        return result.stdout, result.stderr, result.returncode
+        return result.stdout.rstrip(b"\n"), result.stderr.rstrip(b"\n"), result.returncode
     except FileNotFoundError:
         raise ToolExecutionError("git", "Git is not installed or not in PATH")
     except subprocess.TimeoutExpired:
         raise ToolExecutionError("git", f"Git command timed out after {timeout}s")
 
 
+def _decode(data: bytes) -> str:
+    """Decode git output once, with the newline handling text mode pipes had."""
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _run_git_text(
+    args: Sequence[str],
+    cwd: Optional[str] = None,
+    timeout: int = 30,
+    input: Optional[str] = None,
+    env: Optional[dict[str, str]] = None,
+) -> tuple[str, str, int]:
+    """Run a git command and return stdout, stderr, returncode as text."""
+    stdout, stderr, code = _run_git(
+        args,
+        cwd=cwd,
+        timeout=timeout,
+        input=None if input is None else input.encode(),
+        env=env,
+    )
+    return _decode(stdout), _decode(stderr), code
+
+
+_ssh_control_dir: Optional[str] = None
+
+
+def _ssh_env(cwd: str) -> Optional[dict[str, str]]:
+    """
+    Environment that lets git's ssh connections share one master connection.
+
+    Repeated pull/push/clone against the same host then skip the ssh
+    handshake. Returns None, leaving ssh alone, where the user already
+    chose an ssh command or the platform's ssh cannot multiplex.
+    """
+    global _ssh_control_dir
+    if os.name != "posix" or "GIT_SSH_COMMAND" in os.environ or "GIT_SSH" in os.environ:
+        return None
+    _, _, code = _run_git(["config", "core.sshCommand"], cwd=cwd)
+    if code == 0:
+        return None
+    if _ssh_control_dir is None:
+        _ssh_control_dir = tempfile.mkdtemp(prefix="codeagent-ssh-")
+        atexit.register(shutil.rmtree, _ssh_control_dir, True)
+    control_path = shlex.quote(os.path.join(_ssh_control_dir, "%C"))
+    return {
+        "GIT_SSH_COMMAND": (
+            f"ssh -o ControlMaster=auto -o ControlPath={control_path} -o ControlPersist=60"
+        )
+    }
+
+
+# Bytes of stderr kept by _run_git_capped; git's warnings past this are dropped
+_STDERR_CAP = 64 << 10
+
+
+def _drain_stderr(stream: IO[bytes], buffer: bytearray) -> None:
+    """Read a pipe to EOF, keeping its first _STDERR_CAP bytes."""
+    while True:
+        chunk = stream.read1(65536)
+        if not chunk:
+            break
+        if len(buffer) < _STDERR_CAP:
+            buffer += chunk[: _STDERR_CAP - len(buffer)]
+
+
+def _run_git_capped(
+    args: Sequence[str], cwd: Optional[str], limit: int, timeout: int = 30
+) -> tuple[bytes, bytes, int, bool]:
+    """
+    Run a git command, reading at most about limit bytes of its stdout.
+
+    Returns stdout, stderr, returncode and whether the output was cut off.
+    Once the limit is passed git is killed, so the rest is never produced.
+    """
+    try:
+        proc = subprocess.Popen(
+            _git_command(args, cwd),
+            env=_git_env(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        raise ToolExecutionError("git", "Git is not installed or not in PATH")
+
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    # stderr is read alongside stdout, so git never blocks on a full stderr
+    # pipe (CRLF warnings over a large diff) while stdout is being waited on
+    err = bytearray()
+    stderr_reader = threading.Thread(target=_drain_stderr, args=(proc.stderr, err))
+    try:
+        stderr_reader.start()
+        out = bytearray()
+        while len(out) <= limit:
+            chunk = proc.stdout.read1(65536)
+            if not chunk:
+                break
+            out += chunk
+        truncated = len(out) > limit
+        if truncated:
+            proc.kill()
+        stderr_reader.join()
+        code = proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        proc.stderr.close()
+
+    if timed_out.is_set():
+        raise ToolExecutionError("git", f"Git command timed out after {timeout}s")
+    return bytes(out), bytes(err).rstrip(b"\n"), code, truncated
+
+
+class _GitSession:
+    """
+    A long-lived `git cat-file --batch-check` process for one repository.
+
+    Resolving a revision is a line written to its stdin and a line read back,
+    with no process spawn. Only object lookups can go through it; porcelain
+    commands like status, log and diff still need their own git process.
+    """
+
+    def __init__(self, cwd: str) -> None:
+        self._proc = subprocess.Popen(
+            _git_command(_CAT_FILE_ARGS, cwd),
+            env=_git_env(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """Return the object id that rev names, or None if there is no such object."""
+        if "\n" in rev:
+            raise ValueError("revision must be a single line")
+        with self._lock:
+            self._proc.stdin.write(rev.encode() + b"\n")
+            self._proc.stdin.flush()
+            line = self._proc.stdout.readline()
+        if not line:
+            raise BrokenPipeError("git cat-file exited")
+        # "<oid> <type> <size>" on success, "<rev> missing" / "<rev> ambiguous" otherwise
+        fields = line.split()
+        if len(fields) != 3:
+            return None
+        return fields[0].decode()
+
+    def close(self) -> None:
+        """Send EOF and reap the process."""
+        try:
+            self._proc.stdin.close()
+            self._proc.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self._proc.kill()
+
+
+# Open sessions by repository path, least recently used first
+_sessions: "OrderedDict[str, _GitSession]" = OrderedDict()
+_sessions_lock = threading.Lock()
+_sessions_max = 8
+
+# Paths whose session died on its first query, i.e. not a repository;
+# forgotten after any tool that may have modified files, such as git_init
+_not_repos: set[str] = set()
+
+
+def _resolve_rev(cwd: str, rev: str) -> Optional[str]:
+    """
+    Resolve rev in the repository at cwd through its cached _GitSession.
+
+    Raises OSError if no session can serve the query (for example when cwd
+    is not a repository), so callers can fall back to a one-shot command.
+    """
+    key = os.path.abspath(cwd)
+    evicted = None
+    with _sessions_lock:
+        if key in _not_repos:
+            raise OSError(f"not a git repository: {key}")
+        session = _sessions.get(key)
+        fresh = session is None or not session.alive
+        if fresh:
+            try:
+                session = _sessions[key] = _GitSession(key)
+            except FileNotFoundError:
+                raise ToolExecutionError("git", "Git is not installed or not in PATH")
+            if len(_sessions) > _sessions_max:
+                _, evicted = _sessions.popitem(last=False)
+        _sessions.move_to_end(key)
+    if evicted is not None:
+        evicted.close()
+
+    try:
+        return session.resolve(rev)
+    except OSError:
+        if fresh:
+            with _sessions_lock:
+                _not_repos.add(key)
+                if _sessions.get(key) is session:
+                    del _sessions[key]
+            session.close()
+        raise
+
+
+@on_workspace_change
+def _forget_not_repos() -> None:
+    with _sessions_lock:
+        _not_repos.clear()
+
+
+def _is_local_branch(cwd: str, name: str) -> bool:
+    """Whether refs/heads/<name> exists, asked through the cat-file session."""
+    try:
+        return _resolve_rev(cwd, f"refs/heads/{name}") is not None
+    except (OSError, ValueError):
+        return False
+
+
+@atexit.register
+def _close_sessions() -> None:
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+# Results of read-only commands, keyed by (repository, args), oldest first
+_result_cache: "OrderedDict[tuple[str, tuple[str, ...]], tuple[float, Any, tuple[str, str, int]]]" = OrderedDict()
+_result_cache_lock = threading.RLock()
+_result_cache_size = 256
+# Bumped on every invalidation so a command that raced with one is not cached
+_result_cache_generation = 0
+# Commands currently running for a cache miss, by the same key
+_inflight: dict[tuple[str, tuple[str, ...]], "Future[tuple[str, str, int]]"] = {}
+
+
+def _run_git_cached(
+    args: Sequence[str], cwd: str, ttl: float, state: Any = None
+) -> tuple[str, str, int]:
+    """
+    _run_git_text for read-only commands, reusing a result up to ttl seconds old.
+
+    Tools invalidate the cache when they may have changed a repository; the
+    ttl only bounds how long changes made outside the agent go unseen. A
+    cached result is also dropped early when state differs from the state
+    it was stored with.
+    """
+    key = (os.path.abspath(cwd), tuple(args))
+    now = time.monotonic()
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is not None and now - entry[0] < ttl and entry[1] == state:
+            _result_cache.move_to_end(key)
+            return entry[2]
+        generation = _result_cache_generation
+        # A caller arriving while the same command runs waits for that run
+        running = _inflight.get(key)
+        if running is None:
+            future: "Future[tuple[str, str, int]]" = Future()
+            _inflight[key] = future
+    if running is not None:
+        return running.result()
+
+    try:
+        result = _run_git_text(args, cwd=cwd)
+    except BaseException as e:
+        with _result_cache_lock:
+            del _inflight[key]
+        future.set_exception(e)
+        raise
+
+    with _result_cache_lock:
+        del _inflight[key]
+        if generation == _result_cache_generation:
+            _result_cache[key] = (now, state, result)
+            _result_cache.move_to_end(key)
+            if len(_result_cache) > _result_cache_size:
+                _result_cache.popitem(last=False)
+    future.set_result(result)
+    return result
+
+
+def _invalidate_cwd(cwd: str) -> None:
+    """Drop cached results for the repository at cwd."""
+    global _result_cache_generation
+    key = os.path.abspath(cwd)
+    with _result_cache_lock:
+        _result_cache_generation += 1
+        for cached in [k for k in _result_cache if k[0] == key]:
+            del _result_cache[cached]
+
+
+@on_workspace_change
+def _clear_result_cache() -> None:
+    global _result_cache_generation
+    with _result_cache_lock:
+        _result_cache_generation += 1
+        _result_cache.clear()
+
+
+def _parse_status_v2(output: str) -> dict[str, Any]:
+    """Parse `git status --porcelain=v2 --branch` output into a snapshot dict."""
+    snap: dict[str, Any] = {
+        "branch": None,
+        "upstream": None,
+        "ahead": None,
+        "behind": None,
+        "initial": False,
+        "entries": [],
+    }
+    changes = []
+    untracked = []
+    for line in output.splitlines():
+        kind = line[:1]
+        if kind == "#":
+            _, key, value = (line.split(" ", 2) + [""])[:3]
+            if key == "branch.oid":
+                snap["initial"] = value == "(initial)"
+            elif key == "branch.head":
+                snap["branch"] = None if value == "(detached)" else value
+            elif key == "branch.upstream":
+                snap["upstream"] = value
+            elif key == "branch.ab":
+                ahead, behind = value.split()
+                snap["ahead"], snap["behind"] = int(ahead), -int(behind)
+        elif kind == "1":
+            fields = line.split(" ", 8)
+            changes.append((fields[1], fields[8], None))
+        elif kind == "2":
+            fields = line.split(" ", 9)
+            new_path, orig_path = fields[9].split("\t", 1)
+            changes.append((fields[1], new_path, orig_path))
+        elif kind == "u":
+            fields = line.split(" ", 10)
+            changes.append((fields[1], fields[10], None))
+        elif kind == "?":
+            untracked.append(("??", line[2:], None))
+    # v2 lists unmerged paths after the others; short format keeps path order
+    changes.sort(key=lambda entry: entry[1])
+    snap["entries"] = [(xy.replace(".", " "), p, orig) for xy, p, orig in changes] + untracked
+    return snap
+
+
+def _status_state(cwd: str) -> Optional[tuple[int, Optional[tuple[int, int]], Optional[str]]]:
+    """
+    Cheap signals that a cached status is out of date, or None if unavailable.
+
+    The cwd mtime moves when entries are created, deleted or renamed directly
+    in it; the index mtime and size move with outside git add/commit/checkout,
+    as does the HEAD commit. Edits inside existing files are not covered, so
+    the status cache still relies on its ttl for those.
+    """
+    try:
+        cwd_mtime = os.stat(cwd).st_mtime_ns
+    except OSError:
+        return None
+    try:
+        st = os.stat(os.path.join(cwd, ".git", "index"))
+        index: Optional[tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        index = None  # not the top of a repository, or nothing staged yet
+    try:
+        head = _resolve_rev(cwd, "HEAD")
+    except OSError:
+        head = None
+    return cwd_mtime, index, head
+
+
+def _refs_state(cwd: str, kind: str) -> Optional[tuple[int, Optional[tuple[int, int]]]]:
+    """
+    mtime of .git/refs/<kind> plus the packed-refs stat, or None if unavailable.
+
+    Creating or deleting a loose ref changes the directory; packing or
+    deleting a packed one rewrites packed-refs.
+    """
+    git_dir = os.path.join(cwd, ".git")
+    try:
+        refs_mtime = os.stat(os.path.join(git_dir, "refs", kind)).st_mtime_ns
+    except OSError:
+        return None
+    try:
+        st = os.stat(os.path.join(git_dir, "packed-refs"))
+        packed: Optional[tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        packed = None
+    return refs_mtime, packed
+
+
+def _repo_snapshot(cwd: str, ttl: float = 0.0) -> Optional[dict[str, Any]]:
+    """
+    Branch and working tree state of the repository at cwd, from one git process.
+
+    The dict has branch (None when detached), upstream, ahead, behind (None
+    without an upstream), initial (no commits yet) and entries, a list of
+    (XY status, path, original path or None) tuples as in `git status --short`.
+    Returns None if cwd is not in a git repository.
+    """
+    stdout, stderr, code = _run_git_cached(_STATUS_ARGS, cwd, ttl, _status_state(cwd))
+    if code != 0:
+        if code == 128 and stderr.startswith("fatal: not a git repository"):
+            return None
+        raise ToolExecutionError("git", stderr)
+    return _parse_status_v2(stdout)
+
+
+def _format_short_status(snap: dict[str, Any]) -> str:
+    """Render a snapshot the way `git status --short --branch` prints it."""
+    if snap["branch"] is None:
+        header = "## HEAD (no branch)"
+    elif snap["initial"]:
+        header = f"## No commits yet on {snap['branch']}"
+    else:
+        header = f"## {snap['branch']}"
+    if snap["upstream"] and snap["branch"] is not None:
+        header += f"...{snap['upstream']}"
+        if snap["ahead"] is None:
+            header += " [gone]"
+        elif snap["ahead"] or snap["behind"]:
+            counts = []
+            if snap["ahead"]:
+                counts.append(f"ahead {snap['ahead']}")
+            if snap["behind"]:
+                counts.append(f"behind {snap['behind']}")
+            header += f" [{', '.join(counts)}]"
+
+    def quote(path: str) -> str:
+        # Both formats C-quote unusual paths; only --short also quotes spaces
+        return f'"{path}"' if " " in path and path[0] != '"' else path
+
+    lines = [header]
+    for xy, path, orig in snap["entries"]:
+        if orig:
+            lines.append(f"{xy} {quote(orig)} -> {quote(path)}")
+        else:
+            lines.append(f"{xy} {quote(path)}")
+    return "\n".join(lines)
+
+
 class GitStatusTool(Tool):
     """Tool for checking git status."""
 
+    read_only = True
+    CACHE_TTL = 2.0
+
     @property
     def name(self) -> str:
         return "git_status"
@@ -36,35 +575,38 @@ class GitStatusTool(Tool):
     def description(self) -> str:
         return "Show the working tree status - modified, staged, and untracked files."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository (defaults to current directory)",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository (defaults to current directory)",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(self, path: Optional[str] = None, **kwargs: Any) -> str:
         """Get git status."""
         cwd = path or kwargs.get("working_dir", ".")
-        stdout, stderr, code = _run_git(["status", "--short", "--branch"], cwd=cwd)
+        try:
+            snap = _repo_snapshot(cwd, self.CACHE_TTL)
+        except ToolExecutionError as e:
+            raise ToolExecutionError(self.name, e.reason)
 
-        if code != 0:
-            if "not a git repository" in stderr.lower():
-                return "Not a git repository"
-            raise ToolExecutionError(self.name, stderr.strip())
-
-        if not stdout.strip():
-            return "Working tree clean, nothing to commit"
-        return stdout.strip()
+        if snap is None:
+            return "Not a git repository"
+        return _format_short_status(snap)
 
 
 class GitDiffTool(Tool):
     """Tool for showing git diffs."""
 
+    read_only = True
+    MAX_DIFF_BYTES = 256 * 1024
+
     @property
     def name(self) -> str:
         return "git_diff"
@@ -73,60 +615,87 @@ class GitDiffTool(Tool):
     def description(self) -> str:
         return "Show changes between commits, working tree, etc. Shows unstaged changes by default."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+        ToolParameter(
+            name="file",
+            type="string",
+            description="Specific file to diff (optional)",
+            required=False,
+        ),
+        ToolParameter(
+            name="staged",
+            type="boolean",
+            description="Show staged changes instead of unstaged",
+            required=False,
+        ),
+        ToolParameter(
+            name="summary",
+            type="boolean",
+            description="Only list changed files with line counts (diffstat) instead of the full patch",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-            ToolParameter(
-                name="file",
-                type="string",
-                description="Specific file to diff (optional)",
-                required=False,
-            ),
-            ToolParameter(
-                name="staged",
-                type="boolean",
-                description="Show staged changes instead of unstaged",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(
         self,
         path: Optional[str] = None,
         file: Optional[str] = None,
         staged: bool = False,
+        summary: bool = False,
         **kwargs: Any
     ) -> str:
         """Get git diff."""
         cwd = path or kwargs.get("working_dir", ".")
-        args = ["diff"]
+        # Explicit, so color.ui=always in the user's config cannot leak escapes
+        args = ["diff", "--no-color"]
 
         if staged:
             args.append("--cached")
 
+        if summary:
+            args.append("--stat")
+
         if file:
             args.append("--")
             args.append(file)
 
-        stdout, stderr, code = _run_git(args, cwd=cwd)
+        # Diffs can be large, so the output is stripped and decoded once
+        stdout, stderr, code, truncated = _run_git_capped(args, cwd, self.MAX_DIFF_BYTES)
+
+        if truncated:
+            # Cut at a line boundary so no partial hunk line is shown
+            stdout = stdout[: stdout.rfind(b"\n", 0, self.MAX_DIFF_BYTES) + 1]
+            return (
+                _decode(stdout)
+                + f"... (diff truncated at {self.MAX_DIFF_BYTES >> 10}KB;"
+                " pass file to narrow it or summary=true for an overview)"
+            )
 
         if code != 0:
-            raise ToolExecutionError(self.name, stderr.strip())
+            raise ToolExecutionError(self.name, _decode(stderr))
 
-        if not stdout.strip():
+        stdout = stdout.rstrip(b"\n")
+        if not stdout:
             return "No changes" + (" staged" if staged else "")
-        return stdout.strip()
+        return _decode(stdout)
 
 
 class GitLogTool(Tool):
     """Tool for showing git commit history."""
 
+    read_only = True
+    CACHE_TTL = 30.0
+
     @property
     def name(self) -> str:
         return "git_log"
@@ -135,56 +704,91 @@ class GitLogTool(Tool):
     def description(self) -> str:
         return "Show commit history."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+        ToolParameter(
+            name="count",
+            type="integer",
+            description="Number of commits to show (default 10)",
+            required=False,
+        ),
+        ToolParameter(
+            name="oneline",
+            type="boolean",
+            description="Show each commit on one line",
+            required=False,
+        ),
+        ToolParameter(
+            name="structured",
+            type="boolean",
+            description="Show full hash, author, ISO date and subject per commit, tab-separated",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-            ToolParameter(
-                name="count",
-                type="integer",
-                description="Number of commits to show (default 10)",
-                required=False,
-            ),
-            ToolParameter(
-                name="oneline",
-                type="boolean",
-                description="Show each commit on one line",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(
         self,
         path: Optional[str] = None,
         count: int = 10,
         oneline: bool = True,
+        structured: bool = False,
         **kwargs: Any
     ) -> str:
         """Get git log."""
         cwd = path or kwargs.get("working_dir", ".")
-        args = ["log", f"-{count}"]
 
-        if oneline:
+        # An unborn HEAD is answered by the session without spawning git log
+        try:
+            head = _resolve_rev(cwd, "HEAD")
+            if head is None:
+                return "No commits yet"
+        except OSError:
+            head = None
+
+        # Decorations and colors from the user's config are skipped, keeping
+        # the output plain and sparing git the ref lookups for decoration
+        args = ["log", f"-{count}", "--no-decorate", "--no-color"]
+
+        if structured:
+            # NUL between commits, unit separator between fields
+            args += ["-z", "--format=%H%x1f%an%x1f%aI%x1f%s"]
+        elif oneline:
             args.append("--oneline")
 
-        stdout, stderr, code = _run_git(args, cwd=cwd)
+        # Logging the resolved commit puts it in the cache key, so a cached
+        # log is never reused once HEAD has moved
+        if head:
+            args.append(head)
+
+        stdout, stderr, code = _run_git_cached(args, cwd, self.CACHE_TTL)
 
         if code != 0:
-            if "does not have any commits" in stderr.lower():
+            if code == 128 and "does not have any commits" in stderr:
                 return "No commits yet"
-            raise ToolExecutionError(self.name, stderr.strip())
+            raise ToolExecutionError(self.name, stderr)
+
+        if structured:
+            records = [r.split("\x1f", 3) for r in stdout.split("\0") if r]
+            return "\n".join("\t".join(fields) for fields in records) or "No commits"
 
-        return stdout.strip() or "No commits"
+        return stdout or "No commits"
 
 
 class GitAddTool(Tool):
     """Tool for staging files."""
 
+    # Longer file lists are passed on stdin rather than the command line
+    STDIN_PATHSPEC_THRESHOLD = 64
+
     @property
     def name(self) -> str:
         return "git_add"
@@ -193,32 +797,41 @@ class GitAddTool(Tool):
     def description(self) -> str:
         return "Stage files for commit."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="files",
+            type="string",
+            description="Files to stage (space-separated, or '.' for all)",
+            required=True,
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="files",
-                type="string",
-                description="Files to stage (space-separated, or '.' for all)",
-                required=True,
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(self, files: str, path: Optional[str] = None, **kwargs: Any) -> str:
         """Stage files."""
         cwd = path or kwargs.get("working_dir", ".")
         file_list = files.split()
 
-        stdout, stderr, code = _run_git(["add"] + file_list, cwd=cwd)
+        if len(file_list) > self.STDIN_PATHSPEC_THRESHOLD:
+            stdout, stderr, code = _run_git_text(
+                ["add", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                cwd=cwd,
+                input="\0".join(file_list),
+            )
+        else:
+            stdout, stderr, code = _run_git_text(["add"] + file_list, cwd=cwd)
 
         if code != 0:
-            raise ToolExecutionError(self.name, stderr.strip())
+            raise ToolExecutionError(self.name, stderr)
 
         return f"Staged: {files}"
 
@@ -234,42 +847,61 @@ class GitCommitTool(Tool):
     def description(self) -> str:
         return "Create a commit with staged changes."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="message",
+            type="string",
+            description="Commit message",
+            required=True,
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="message",
-                type="string",
-                description="Commit message",
-                required=True,
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(self, message: str, path: Optional[str] = None, **kwargs: Any) -> str:
         """Create a commit."""
         cwd = path or kwargs.get("working_dir", ".")
 
+        # `diff --cached --quiet` exits 0 when nothing is staged, without the
+        # tree write and hooks of a commit that would then fail. A pending
+        # merge can be committed with no staged changes, so it is exempt.
+        _, _, staged = _run_git(_STAGED_CHECK_ARGS, cwd=cwd)
+        if staged == 0 and not self._merge_in_progress(cwd):
+            return "Nothing to commit"
+
         stdout, stderr, code = _run_git(["commit", "-m", message], cwd=cwd)
 
         if code != 0:
-            if "nothing to commit" in stdout.lower() or "nothing to commit" in stderr.lower():
+            # git prints the status, ending in "nothing to commit", and exits 1
+            if code == 1 and b"nothing to commit" in stdout[-200:]:
                 return "Nothing to commit"
-            raise ToolExecutionError(self.name, stderr.strip() or stdout.strip())
+            raise ToolExecutionError(self.name, _decode(stderr or stdout))
 
-        # Extract commit hash from output
-        lines = stdout.strip().split("\n")
-        return lines[0] if lines else "Committed"
+        # Only the summary line ("[main 1a2b3c4] message") is decoded and returned
+        summary = stdout.lstrip().partition(b"\n")[0].rstrip()
+        return _decode(summary) or "Committed"
+
+    @staticmethod
+    def _merge_in_progress(cwd: str) -> bool:
+        try:
+            return _resolve_rev(cwd, "MERGE_HEAD") is not None
+        except OSError:
+            return True  # unknown, so let git commit decide
 
 
 class GitBranchTool(Tool):
     """Tool for listing and managing branches."""
 
+    CACHE_TTL = 30.0
+
     @property
     def name(self) -> str:
         return "git_branch"
@@ -278,22 +910,27 @@ class GitBranchTool(Tool):
     def description(self) -> str:
         return "List branches or create a new branch."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="name",
+            type="string",
+            description="Name of new branch to create (omit to list branches)",
+            required=False,
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="name",
-                type="string",
-                description="Name of new branch to create (omit to list branches)",
-                required=False,
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
+
+    def is_read_only(self, **kwargs: Any) -> bool:
+        return not kwargs.get("name")  # listing only
 
     def execute(self, name: Optional[str] = None, path: Optional[str] = None, **kwargs: Any) -> str:
         """List or create branches."""
@@ -301,16 +938,21 @@ class GitBranchTool(Tool):
 
         if name:
             # Create new branch
-            stdout, stderr, code = _run_git(["branch", name], cwd=cwd)
+            stdout, stderr, code = _run_git_text(["branch", name], cwd=cwd)
+            _invalidate_cwd(cwd)
             if code != 0:
-                raise ToolExecutionError(self.name, stderr.strip())
+                raise ToolExecutionError(self.name, stderr)
             return f"Created branch: {name}"
         else:
             # List branches
-            stdout, stderr, code = _run_git(["branch", "-a"], cwd=cwd)
+            if _git_version() >= (2, 13):
+                args = _BRANCH_LIST_ARGS
+            else:
+                args = ("branch", "-a")
+            stdout, stderr, code = _run_git_cached(args, cwd, self.CACHE_TTL)
             if code != 0:
-                raise ToolExecutionError(self.name, stderr.strip())
-            return stdout.strip() or "No branches"
+                raise ToolExecutionError(self.name, stderr)
+            return stdout or "No branches"
 
 
 class GitCheckoutTool(Tool):
@@ -324,28 +966,30 @@ class GitCheckoutTool(Tool):
     def description(self) -> str:
         return "Switch branches or restore working tree files."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="target",
+            type="string",
+            description="Branch name or commit to checkout",
+            required=True,
+        ),
+        ToolParameter(
+            name="create",
+            type="boolean",
+            description="Create a new branch (-b flag)",
+            required=False,
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="target",
-                type="string",
-                description="Branch name or commit to checkout",
-                required=True,
-            ),
-            ToolParameter(
-                name="create",
-                type="boolean",
-                description="Create a new branch (-b flag)",
-                required=False,
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(
         self,
@@ -356,16 +1000,22 @@ class GitCheckoutTool(Tool):
     ) -> str:
         """Checkout branch or commit."""
         cwd = path or kwargs.get("working_dir", ".")
-        args = ["checkout"]
 
-        if create:
-            args.append("-b")
-        args.append(target)
+        # switch skips checkout's guessing between a ref and a pathspec, but
+        # only handles branches; commits and file restores still use checkout
+        if _git_version() < (2, 23):
+            args = ["checkout", "-b", target] if create else ["checkout", target]
+        elif create:
+            args = ["switch", "-c", target]
+        elif _is_local_branch(cwd, target):
+            args = ["switch", target]
+        else:
+            args = ["checkout", target]
 
-        stdout, stderr, code = _run_git(args, cwd=cwd)
+        stdout, stderr, code = _run_git_text(args, cwd=cwd)
 
         if code != 0:
-            raise ToolExecutionError(self.name, stderr.strip())
+            raise ToolExecutionError(self.name, stderr)
 
         return f"Switched to {'new branch' if create else 'branch'}: {target}"
 
@@ -381,27 +1031,29 @@ class GitInitTool(Tool):
     def description(self) -> str:
         return "Initialize a new git repository."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path where to initialize the repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path where to initialize the repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(self, path: Optional[str] = None, **kwargs: Any) -> str:
         """Initialize git repository."""
         cwd = path or kwargs.get("working_dir", ".")
 
-        stdout, stderr, code = _run_git(["init"], cwd=cwd)
+        stdout, stderr, code = _run_git_text(["init"], cwd=cwd)
 
         if code != 0:
-            raise ToolExecutionError(self.name, stderr.strip())
+            raise ToolExecutionError(self.name, stderr)
 
-        if "reinitialized" in stdout.lower():
+        if stdout.startswith("Reinitialized"):
             return f"Reinitialized existing Git repository in {cwd}"
         return f"Initialized empty Git repository in {cwd}"
 
@@ -409,6 +1061,15 @@ class GitInitTool(Tool):
 class GitStashTool(Tool):
     """Tool for stashing changes."""
 
+    # argv prefix for each action; push also takes -m, the rest a stash id
+    _ACTIONS = {
+        "push": ("stash", "push"),
+        "pop": ("stash", "pop"),
+        "apply": ("stash", "apply"),
+        "list": ("stash", "list"),
+        "drop": ("stash", "drop"),
+    }
+
     @property
     def name(self) -> str:
         return "git_stash"
@@ -417,36 +1078,38 @@ class GitStashTool(Tool):
     def description(self) -> str:
         return "Stash changes in working directory. Can also list, pop, or apply stashes."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="action",
+            type="string",
+            description="Action to perform: push (default), pop, apply, list, drop",
+            required=False,
+            default="push",
+            enum=list(_ACTIONS),
+        ),
+        ToolParameter(
+            name="message",
+            type="string",
+            description="Message for the stash (only for push action)",
+            required=False,
+        ),
+        ToolParameter(
+            name="stash_id",
+            type="string",
+            description="Stash reference like 'stash@{0}' (for pop, apply, drop)",
+            required=False,
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="action",
-                type="string",
-                description="Action to perform: push (default), pop, apply, list, drop",
-                required=False,
-                default="push",
-                enum=["push", "pop", "apply", "list", "drop"],
-            ),
-            ToolParameter(
-                name="message",
-                type="string",
-                description="Message for the stash (only for push action)",
-                required=False,
-            ),
-            ToolParameter(
-                name="stash_id",
-                type="string",
-                description="Stash reference like 'stash@{0}' (for pop, apply, drop)",
-                required=False,
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(
         self,
@@ -459,32 +1122,30 @@ class GitStashTool(Tool):
         """Stash operations."""
         cwd = path or kwargs.get("working_dir", ".")
 
+        base = self._ACTIONS.get(action)
+        if base is None:
+            raise ToolExecutionError(self.name, f"Unknown action: {action}")
+
+        args = list(base)
         if action == "push":
-            args = ["stash", "push"]
             if message:
                 args.extend(["-m", message])
-        elif action == "list":
-            args = ["stash", "list"]
-        elif action in ("pop", "apply", "drop"):
-            args = ["stash", action]
-            if stash_id:
-                args.append(stash_id)
-        else:
-            raise ToolExecutionError(self.name, f"Unknown action: {action}")
+        elif action != "list" and stash_id:
+            args.append(stash_id)
 
-        stdout, stderr, code = _run_git(args, cwd=cwd)
+        stdout, stderr, code = _run_git_text(args, cwd=cwd)
 
         if code != 0:
             if "No stash entries" in stderr or "No local changes" in stdout:
                 return "No stash entries found" if action == "list" else "No local changes to stash"
-            raise ToolExecutionError(self.name, stderr.strip() or stdout.strip())
+            raise ToolExecutionError(self.name, stderr or stdout)
 
         if action == "list":
-            return stdout.strip() if stdout.strip() else "No stash entries"
+            return stdout or "No stash entries"
         elif action == "push":
-            return stdout.strip() if stdout.strip() else "Changes stashed"
+            return stdout or "Changes stashed"
         else:
-            return stdout.strip() if stdout.strip() else f"Stash {action} completed"
+            return stdout or f"Stash {action} completed"
 
 
 class GitPullTool(Tool):
@@ -498,36 +1159,38 @@ class GitPullTool(Tool):
     def description(self) -> str:
         return "Pull changes from remote repository."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="remote",
+            type="string",
+            description="Remote name (default: origin)",
+            required=False,
+            default="origin",
+        ),
+        ToolParameter(
+            name="branch",
+            type="string",
+            description="Branch to pull (default: current branch)",
+            required=False,
+        ),
+        ToolParameter(
+            name="rebase",
+            type="boolean",
+            description="Use rebase instead of merge",
+            required=False,
+            default=False,
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="remote",
-                type="string",
-                description="Remote name (default: origin)",
-                required=False,
-                default="origin",
-            ),
-            ToolParameter(
-                name="branch",
-                type="string",
-                description="Branch to pull (default: current branch)",
-                required=False,
-            ),
-            ToolParameter(
-                name="rebase",
-                type="boolean",
-                description="Use rebase instead of merge",
-                required=False,
-                default=False,
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(
         self,
@@ -548,12 +1211,12 @@ class GitPullTool(Tool):
         if branch:
             args.append(branch)
 
-        stdout, stderr, code = _run_git(args, cwd=cwd, timeout=120)
+        stdout, stderr, code = _run_git_text(args, cwd=cwd, timeout=120, env=_ssh_env(cwd))
 
         if code != 0:
-            raise ToolExecutionError(self.name, stderr.strip() or stdout.strip())
+            raise ToolExecutionError(self.name, stderr or stdout)
 
-        return stdout.strip() if stdout.strip() else "Already up to date"
+        return stdout or "Already up to date"
 
 
 class GitPushTool(Tool):
@@ -567,43 +1230,45 @@ class GitPushTool(Tool):
     def description(self) -> str:
         return "Push commits to remote repository."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="remote",
+            type="string",
+            description="Remote name (default: origin)",
+            required=False,
+            default="origin",
+        ),
+        ToolParameter(
+            name="branch",
+            type="string",
+            description="Branch to push (default: current branch)",
+            required=False,
+        ),
+        ToolParameter(
+            name="set_upstream",
+            type="boolean",
+            description="Set upstream tracking reference (-u flag)",
+            required=False,
+            default=False,
+        ),
+        ToolParameter(
+            name="tags",
+            type="boolean",
+            description="Push all tags",
+            required=False,
+            default=False,
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="remote",
-                type="string",
-                description="Remote name (default: origin)",
-                required=False,
-                default="origin",
-            ),
-            ToolParameter(
-                name="branch",
-                type="string",
-                description="Branch to push (default: current branch)",
-                required=False,
-            ),
-            ToolParameter(
-                name="set_upstream",
-                type="boolean",
-                description="Set upstream tracking reference (-u flag)",
-                required=False,
-                default=False,
-            ),
-            ToolParameter(
-                name="tags",
-                type="boolean",
-                description="Push all tags",
-                required=False,
-                default=False,
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(
         self,
@@ -628,13 +1293,13 @@ class GitPushTool(Tool):
         if branch:
             args.append(branch)
 
-        stdout, stderr, code = _run_git(args, cwd=cwd, timeout=120)
+        stdout, stderr, code = _run_git_text(args, cwd=cwd, timeout=120, env=_ssh_env(cwd))
 
         if code != 0:
-            raise ToolExecutionError(self.name, stderr.strip() or stdout.strip())
+            raise ToolExecutionError(self.name, stderr or stdout)
 
         # Git push outputs to stderr on success
-        output = stderr.strip() or stdout.strip()
+        output = stderr or stdout
         return output if output else "Push completed"
 
 
@@ -649,31 +1314,33 @@ class GitResetTool(Tool):
     def description(self) -> str:
         return "Reset current HEAD to a specified state. Can unstage files or reset commits."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="target",
+            type="string",
+            description="Commit, branch, or file to reset to (default: HEAD)",
+            required=False,
+            default="HEAD",
+        ),
+        ToolParameter(
+            name="mode",
+            type="string",
+            description="Reset mode: soft (keep changes staged), mixed (unstage changes, default), hard (discard all changes)",
+            required=False,
+            default="mixed",
+            enum=["soft", "mixed", "hard"],
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="target",
-                type="string",
-                description="Commit, branch, or file to reset to (default: HEAD)",
-                required=False,
-                default="HEAD",
-            ),
-            ToolParameter(
-                name="mode",
-                type="string",
-                description="Reset mode: soft (keep changes staged), mixed (unstage changes, default), hard (discard all changes)",
-                required=False,
-                default="mixed",
-                enum=["soft", "mixed", "hard"],
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(
         self,
@@ -686,12 +1353,12 @@ class GitResetTool(Tool):
         cwd = path or kwargs.get("working_dir", ".")
         args = ["reset", f"--{mode}", target]
 
-        stdout, stderr, code = _run_git(args, cwd=cwd)
+        stdout, stderr, code = _run_git_text(args, cwd=cwd)
 
         if code != 0:
-            raise ToolExecutionError(self.name, stderr.strip() or stdout.strip())
+            raise ToolExecutionError(self.name, stderr or stdout)
 
-        output = stdout.strip() or stderr.strip()
+        output = stdout or stderr
         if not output:
             if mode == "hard":
                 return f"Hard reset to {target}"
@@ -713,35 +1380,37 @@ class GitMergeTool(Tool):
     def description(self) -> str:
         return "Merge a branch into the current branch."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="branch",
+            type="string",
+            description="Branch to merge into current branch",
+            required=True,
+        ),
+        ToolParameter(
+            name="no_ff",
+            type="boolean",
+            description="Create a merge commit even for fast-forward merges",
+            required=False,
+            default=False,
+        ),
+        ToolParameter(
+            name="message",
+            type="string",
+            description="Merge commit message",
+            required=False,
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="branch",
-                type="string",
-                description="Branch to merge into current branch",
-                required=True,
-            ),
-            ToolParameter(
-                name="no_ff",
-                type="boolean",
-                description="Create a merge commit even for fast-forward merges",
-                required=False,
-                default=False,
-            ),
-            ToolParameter(
-                name="message",
-                type="string",
-                description="Merge commit message",
-                required=False,
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(
         self,
@@ -763,14 +1432,15 @@ class GitMergeTool(Tool):
 
         args.append(branch)
 
-        stdout, stderr, code = _run_git(args, cwd=cwd)
+        stdout, stderr, code = _run_git_text(args, cwd=cwd)
 
         if code != 0:
-            if "CONFLICT" in stdout or "CONFLICT" in stderr:
+            # git merge exits 1 when it stops on conflicts
+            if code == 1 and ("CONFLICT" in stdout or "CONFLICT" in stderr):
                 return f"Merge conflict detected:\n{stdout}\n{stderr}"
-            raise ToolExecutionError(self.name, stderr.strip() or stdout.strip())
+            raise ToolExecutionError(self.name, stderr or stdout)
 
-        return stdout.strip() if stdout.strip() else f"Merged {branch}"
+        return stdout or f"Merged {branch}"
 
 
 class GitCloneTool(Tool):
@@ -784,40 +1454,51 @@ class GitCloneTool(Tool):
     def description(self) -> str:
         return "Clone a repository from a URL."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="url",
+            type="string",
+            description="Repository URL to clone",
+            required=True,
+        ),
+        ToolParameter(
+            name="directory",
+            type="string",
+            description="Directory to clone into (optional, defaults to repo name)",
+            required=False,
+        ),
+        ToolParameter(
+            name="branch",
+            type="string",
+            description="Branch to clone (default: default branch)",
+            required=False,
+        ),
+        ToolParameter(
+            name="depth",
+            type="integer",
+            description="Create a shallow clone with specified depth",
+            required=False,
+        ),
+        ToolParameter(
+            name="full_history",
+            type="boolean",
+            description=(
+                "Download every file version up front. By default only the checked-out "
+                "files are fetched and older versions are downloaded when first needed."
+            ),
+            required=False,
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to clone into",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="url",
-                type="string",
-                description="Repository URL to clone",
-                required=True,
-            ),
-            ToolParameter(
-                name="directory",
-                type="string",
-                description="Directory to clone into (optional, defaults to repo name)",
-                required=False,
-            ),
-            ToolParameter(
-                name="branch",
-                type="string",
-                description="Branch to clone (default: default branch)",
-                required=False,
-            ),
-            ToolParameter(
-                name="depth",
-                type="integer",
-                description="Create a shallow clone with specified depth",
-                required=False,
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to clone into",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(
         self,
@@ -825,6 +1506,7 @@ class GitCloneTool(Tool):
         directory: Optional[str] = None,
         branch: Optional[str] = None,
         depth: Optional[int] = None,
+        full_history: bool = False,
         path: Optional[str] = None,
         **kwargs: Any
     ) -> str:
@@ -837,25 +1519,37 @@ class GitCloneTool(Tool):
 
         if depth:
             args.extend(["--depth", str(depth)])
+        elif not full_history and not os.path.isdir(os.path.join(cwd, url)):
+            # Blobless partial clone: full commit history, file contents on
+            # demand. Local clones hardlink objects and would ignore the filter.
+            args.append("--filter=blob:none")
 
         args.append(url)
 
         if directory:
             args.append(directory)
 
-        stdout, stderr, code = _run_git(args, cwd=cwd, timeout=300)
+        stdout, stderr, code = _run_git_text(args, cwd=cwd, timeout=300, env=_ssh_env(cwd))
 
         if code != 0:
-            raise ToolExecutionError(self.name, stderr.strip() or stdout.strip())
+            raise ToolExecutionError(self.name, stderr or stdout)
 
         # Git clone outputs to stderr
-        output = stderr.strip() or stdout.strip()
+        output = stderr or stdout
         return output if output else f"Cloned {url}"
 
 
 class GitRemoteTool(Tool):
     """Tool for managing remotes."""
 
+    # argv prefix for each action, and the arguments appended to it
+    _ACTIONS = {
+        "list": (("remote", "-v"), ()),
+        "add": (("remote", "add"), ("name", "url")),
+        "remove": (("remote", "remove"), ("name",)),
+        "get-url": (("remote", "get-url"), ("name",)),
+    }
+
     @property
     def name(self) -> str:
         return "git_remote"
@@ -864,36 +1558,38 @@ class GitRemoteTool(Tool):
     def description(self) -> str:
         return "Manage remote repositories. List, add, remove, or show remote URLs."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="action",
+            type="string",
+            description="Action: list (default), add, remove, get-url",
+            required=False,
+            default="list",
+            enum=list(_ACTIONS),
+        ),
+        ToolParameter(
+            name="name",
+            type="string",
+            description="Remote name (required for add, remove, get-url)",
+            required=False,
+        ),
+        ToolParameter(
+            name="url",
+            type="string",
+            description="Remote URL (required for add)",
+            required=False,
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="action",
-                type="string",
-                description="Action: list (default), add, remove, get-url",
-                required=False,
-                default="list",
-                enum=["list", "add", "remove", "get-url"],
-            ),
-            ToolParameter(
-                name="name",
-                type="string",
-                description="Remote name (required for add, remove, get-url)",
-                required=False,
-            ),
-            ToolParameter(
-                name="url",
-                type="string",
-                description="Remote URL (required for add)",
-                required=False,
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
 
     def execute(
         self,
@@ -906,41 +1602,38 @@ class GitRemoteTool(Tool):
         """Manage remotes."""
         cwd = path or kwargs.get("working_dir", ".")
 
-        if action == "list":
-            args = ["remote", "-v"]
-        elif action == "add":
-            if not name or not url:
-                raise ToolExecutionError(self.name, "Both name and url are required for add")
-            args = ["remote", "add", name, url]
-        elif action == "remove":
-            if not name:
-                raise ToolExecutionError(self.name, "Name is required for remove")
-            args = ["remote", "remove", name]
-        elif action == "get-url":
-            if not name:
-                raise ToolExecutionError(self.name, "Name is required for get-url")
-            args = ["remote", "get-url", name]
-        else:
+        spec = self._ACTIONS.get(action)
+        if spec is None:
             raise ToolExecutionError(self.name, f"Unknown action: {action}")
 
-        stdout, stderr, code = _run_git(args, cwd=cwd)
+        base, required = spec
+        values = {"name": name, "url": url}
+        if not all(values[arg] for arg in required):
+            if len(required) > 1:
+                raise ToolExecutionError(self.name, f"Both name and url are required for {action}")
+            raise ToolExecutionError(self.name, f"Name is required for {action}")
+        args = [*base, *(values[arg] for arg in required)]
+
+        stdout, stderr, code = _run_git_text(args, cwd=cwd)
 
         if code != 0:
-            raise ToolExecutionError(self.name, stderr.strip() or stdout.strip())
+            raise ToolExecutionError(self.name, stderr or stdout)
 
         if action == "list":
-            return stdout.strip() if stdout.strip() else "No remotes configured"
+            return stdout or "No remotes configured"
         elif action == "add":
             return f"Added remote '{name}' -> {url}"
         elif action == "remove":
             return f"Removed remote '{name}'"
         else:
-            return stdout.strip()
+            return stdout
 
 
 class GitTagTool(Tool):
     """Tool for managing tags."""
 
+    CACHE_TTL = 30.0
+
     @property
     def name(self) -> str:
         return "git_tag"
@@ -949,35 +1642,40 @@ class GitTagTool(Tool):
     def description(self) -> str:
         return "List, create, or delete tags."
 
+    _PARAMETERS = (
+        ToolParameter(
+            name="name",
+            type="string",
+            description="Tag name (omit to list tags)",
+            required=False,
+        ),
+        ToolParameter(
+            name="message",
+            type="string",
+            description="Tag message (creates annotated tag)",
+            required=False,
+        ),
+        ToolParameter(
+            name="delete",
+            type="boolean",
+            description="Delete the specified tag",
+            required=False,
+            default=False,
+        ),
+        ToolParameter(
+            name="path",
+            type="string",
+            description="Path to the git repository",
+            required=False,
+        ),
+    )
+
     @property
     def parameters(self) -> list[ToolParameter]:
-        return [
-            ToolParameter(
-                name="name",
-                type="string",
-                description="Tag name (omit to list tags)",
-                required=False,
-            ),
-            ToolParameter(
-                name="message",
-                type="string",
-                description="Tag message (creates annotated tag)",
-                required=False,
-            ),
-            ToolParameter(
-                name="delete",
-                type="boolean",
-                description="Delete the specified tag",
-                required=False,
-                default=False,
-            ),
-            ToolParameter(
-                name="path",
-                type="string",
-                description="Path to the git repository",
-                required=False,
-            ),
-        ]
+        return list(self._PARAMETERS)
+
+    def is_read_only(self, **kwargs: Any) -> bool:
+        return kwargs.get("name") is None  # listing only
 
     def execute(
         self,
@@ -991,8 +1689,8 @@ class GitTagTool(Tool):
         cwd = path or kwargs.get("working_dir", ".")
 
         if name is None:
-            # List tags
-            args = ["tag", "-l"]
+            # List tags, with the commit and date each points at
+            args = _TAG_LIST_ARGS
         elif delete:
             args = ["tag", "-d", name]
         elif message:
@@ -1002,13 +1700,19 @@ class GitTagTool(Tool):
             # Lightweight tag
             args = ["tag", name]
 
-        stdout, stderr, code = _run_git(args, cwd=cwd)
+        if name is None:
+            stdout, stderr, code = _run_git_cached(
+                args, cwd, self.CACHE_TTL, _refs_state(cwd, "tags")
+            )
+        else:
+            stdout, stderr, code = _run_git_text(args, cwd=cwd)
+            _invalidate_cwd(cwd)
 
         if code != 0:
-            raise ToolExecutionError(self.name, stderr.strip() or stdout.strip())
+            raise ToolExecutionError(self.name, stderr or stdout)
 
         if name is None:
-            return stdout.strip() if stdout.strip() else "No tags"
+            return stdout or "No tags"
         elif delete:
             return f"Deleted tag '{name}'"
         else:
@@ -1,16 +1,48 @@
 """Glob tool for finding files by pattern."""
 
+import fnmatch
+import functools
 import os
-from pathlib import Path
-from typing import Any
+import re
+from pathlib import PurePath
+from typing import Any, Callable, Iterator, Optional
 
 from codeagent.core.exceptions import ToolExecutionError
-from codeagent.tools.base import Tool, ToolParameter
+from codeagent.tools.base import Tool, ToolParameter, resolve_path
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(
+    pattern: str,
+) -> tuple[tuple[str, ...], tuple[Optional[Callable[..., Any]], ...]]:
+    """
+    Split a glob pattern into components, with a regex match per wildcard one.
+
+    Literal components and "**" get None. Cached, since the same patterns
+    are globbed over and over.
+    """
+    pure = PurePath(pattern)
+    if pure.anchor:
+        raise ValueError("Non-relative patterns are unsupported")
+    parts = pure.parts
+    if not parts:
+        raise ValueError(f"Unacceptable pattern: {pattern!r}")
+
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    matchers = tuple(
+        re.compile(fnmatch.translate(part), flags).match
+        if part != "**" and any(c in part for c in "*?[")
+        else None
+        for part in parts
+    )
+    return parts, matchers
 
 
 class GlobTool(Tool):
     """Tool for finding files using glob patterns."""
 
+    read_only = True
+
     # Directories to ignore
     DEFAULT_IGNORE = [
         "__pycache__",
@@ -30,6 +62,9 @@ class GlobTool(Tool):
         "*.egg-info",
     ]
 
+    _IGNORED_NAMES = frozenset(p for p in DEFAULT_IGNORE if not p.startswith("*"))
+    _IGNORED_SUFFIXES = tuple(p[1:] for p in DEFAULT_IGNORE if p.startswith("*"))
+
     @property
     def name(self) -> str:
         return "glob"
@@ -94,7 +129,7 @@ class GlobTool(Tool):
         Returns:
             List of matching file paths
         """
-        base_path = Path(path).expanduser() if path else Path.cwd()
+        base_path = resolve_path(path or ".", kwargs.get("working_dir"))
 
         if not base_path.exists():
             raise ToolExecutionError(
@@ -110,24 +145,8 @@ class GlobTool(Tool):
 
         try:
             matches = []
-            for match in base_path.glob(pattern):
-                # Skip ignored directories
-                if self._should_ignore(match):
-                    continue
-
-                # Skip hidden files unless requested
-                if not include_hidden and self._is_hidden(match, base_path):
-                    continue
-
-                # Only include files, not directories
-                if match.is_file():
-                    # Get relative path for cleaner output
-                    try:
-                        rel_path = match.relative_to(base_path)
-                        matches.append(str(rel_path))
-                    except ValueError:
-                        matches.append(str(match))
-
+            for match in self._iter_matches(str(base_path), pattern, include_hidden):
+                matches.append(match)
                 if len(matches) >= max_results:
                     break
 
@@ -149,24 +168,100 @@ class GlobTool(Tool):
                 f"Glob search failed: {e}",
             )
 
-    def _should_ignore(self, path: Path) -> bool:
-        """Check if path should be ignored."""
-        parts = path.parts
-        for ignore_pattern in self.DEFAULT_IGNORE:
-            if ignore_pattern.startswith("*"):
-                # Handle wildcard patterns like *.egg-info
-                suffix = ignore_pattern[1:]
-                if any(part.endswith(suffix) for part in parts):
-                    return True
+    def _is_skipped(self, name: str, include_hidden: bool) -> bool:
+        """Check if a path component is ignored or, unless requested, hidden."""
+        return (
+            (not include_hidden and name.startswith("."))
+            or name in self._IGNORED_NAMES
+            or name.endswith(self._IGNORED_SUFFIXES)
+        )
+
+    def _iter_matches(self, base: str, pattern: str, include_hidden: bool) -> Iterator[str]:
+        """
+        Yield paths, relative to base, of the files matching pattern.
+
+        Matches Path.glob, but ignored and hidden directories are pruned
+        before they are scanned, and paths stay strings throughout.
+        """
+        parts, matchers = _compile_pattern(pattern)
+        last = len(parts) - 1
+
+        # The literal leading components are joined and checked in one go,
+        # so "src/codeagent/tools/*.py" starts scanning in tools/
+        start = 0
+        while start <= last and parts[start] != "**" and matchers[start] is None:
+            if parts[start] != ".." and self._is_skipped(parts[start], include_hidden):
+                return
+            start += 1
+        prefix = os.path.join(*parts[:start]) if start else ""
+        root = os.path.join(base, prefix) if prefix else base
+        if start > last:
+            if os.path.isfile(root):
+                yield prefix
+            return
+        if prefix and not os.path.isdir(root):
+            return
+
+        # "**" can reach the same file along more than one route
+        yielded: set[str] = set()
+
+        # Each directory carries its path relative to base, with a trailing
+        # separator, so a child's relative path is a single concatenation
+        stack = [(root, prefix + os.sep if prefix else "", start)]
+        while stack:
+            directory, rel, i = stack.pop()
+            part = parts[i]
+
+            if part == "**":
+                # Matches directory itself and every subdirectory below it;
+                # as in Path.glob, symlinked directories are not followed
+                if i == last:
+                    continue  # only directories can match, never files
+                stack.append((directory, rel, i + 1))
+                try:
+                    with os.scandir(directory) as it:
+                        for entry in it:
+                            if entry.is_dir(follow_symlinks=False) and not self._is_skipped(
+                                entry.name, include_hidden
+                            ):
+                                stack.append((entry.path, rel + entry.name + os.sep, i))
+                except OSError:
+                    pass
+                continue
+
+            match = matchers[i]
+            if match is None:
+                # A literal component needs no directory listing
+                if part != ".." and self._is_skipped(part, include_hidden):
+                    continue
+                path = os.path.join(directory, part)
+                if i == last:
+                    found = os.path.isfile(path)
+                else:
+                    found = os.path.isdir(path)
+                candidates = [(path, part, found)]
             else:
-                if ignore_pattern in parts:
-                    return True
-        return False
+                try:
+                    with os.scandir(directory) as it:
+                        candidates = [
+                            (
+                                entry.path,
+                                entry.name,
+                                entry.is_file() if i == last else entry.is_dir(),
+                            )
+                            for entry in it
+                            if match(entry.name)
+                            and not self._is_skipped(entry.name, include_hidden)
+                        ]
+                except OSError:
+                    continue
 
-    def _is_hidden(self, path: Path, base: Path) -> bool:
-        """Check if any component of the path (relative to base) is hidden."""
-        try:
-            rel = path.relative_to(base)
-            return any(part.startswith(".") for part in rel.parts)
-        except ValueError:
-            return path.name.startswith(".")
+            for path, name, found in candidates:
+                if not found:
+                    continue
+                child = rel + name
+                if i < last:
+                    stack.append((path, child + os.sep, i + 1))
+                elif child not in yielded:
+                    yielded.add(child)
+                    yield child
@@ -2,17 +2,49 @@
 
 import os
 import re
+import shutil
 import subprocess
+import threading
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from codeagent.core.exceptions import ToolExecutionError
-from codeagent.tools.base import Tool, ToolParameter
+from codeagent.tools.base import Tool, ToolParameter, resolve_path
+
+# A pattern without any of these matches only itself, so it can be searched
+# as a fixed string instead of compiled as a regex
+_REGEX_METACHARS = frozenset(".^$*+?()[]{}|\\")
+
+
+_executables: dict[str, str] = {}
+
+
+def _which(name: str) -> Optional[str]:
+    """
+    Absolute path of a search command, looked up on PATH once it is found.
+
+    Misses are not remembered, so a tool installed mid-session is picked up.
+    """
+    path = _executables.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path is not None:
+            _executables[name] = path
+    return path
 
 
 class GrepTool(Tool):
     """Tool for searching file contents using patterns."""
 
+    read_only = True
+
+    # Seconds before a search is killed
+    SEARCH_TIMEOUT = 30
+
+    # ripgrep caps its own default at 12 threads
+    RG_THREADS = os.cpu_count() or 4
+
     @property
     def name(self) -> str:
         return "grep"
@@ -92,7 +124,7 @@ class GrepTool(Tool):
         Returns:
             Matching lines with file paths and line numbers
         """
-        search_path = Path(path).expanduser() if path else Path.cwd()
+        search_path = resolve_path(path or ".", kwargs.get("working_dir"))
 
         if not search_path.exists():
             raise ToolExecutionError(
@@ -100,25 +132,19 @@ class GrepTool(Tool):
                 f"Path not found: {search_path}",
             )
 
-        # Try to use ripgrep (rg) first, fall back to grep
-        try:
-            return self._search_with_rg(
-                pattern=pattern,
-                path=search_path,
-                include=include,
-                ignore_case=ignore_case,
-                context_lines=context_lines,
-                max_results=max_results,
-            )
-        except FileNotFoundError:
-            return self._search_with_grep(
-                pattern=pattern,
-                path=search_path,
-                include=include,
-                ignore_case=ignore_case,
-                context_lines=context_lines,
-                max_results=max_results,
-            )
+        fixed_strings = _REGEX_METACHARS.isdisjoint(pattern)
+
+        # Use ripgrep (rg) if installed, fall back to grep
+        search = self._search_with_rg if _which("rg") else self._search_with_grep
+        return search(
+            pattern=pattern,
+            path=search_path,
+            include=include,
+            ignore_case=ignore_case,
+            context_lines=context_lines,
+            max_results=max_results,
+            fixed_strings=fixed_strings,
+        )
 
     def _search_with_rg(
         self,
@@ -128,45 +154,30 @@ class GrepTool(Tool):
         ignore_case: bool,
         context_lines: int,
         max_results: int,
+        fixed_strings: bool = False,
     ) -> str:
         """Search using ripgrep."""
-        cmd = ["rg", "--line-number", "--no-heading", "--color=never"]
+        cmd = [_which("rg") or "rg", "--line-number", "--no-heading", "--color=never"]
+        cmd.extend(["--threads", str(self.RG_THREADS)])
 
         if ignore_case:
             cmd.append("--ignore-case")
 
+        if fixed_strings:
+            cmd.append("--fixed-strings")
+
         if context_lines > 0:
             cmd.extend(["-C", str(context_lines)])
 
         if include:
             cmd.extend(["--glob", include])
 
+        # Per file only; the overall limit is enforced by _run_search
         cmd.extend(["--max-count", str(max_results)])
         cmd.append(pattern)
         cmd.append(str(path))
 
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            output = result.stdout
-            if not output:
-                return f"No matches found for pattern: {pattern}"
-
-            # Truncate if too long
-            lines = output.split("\n")
-            if len(lines) > max_results:
-                lines = lines[:max_results]
-                output = "\n".join(lines) + f"\n\n... (showing first {max_results} results)"
-
-            return output
-
-        except subprocess.TimeoutExpired:
-            raise ToolExecutionError(self.name, "Search timed out")
+        return self._run_search(cmd, pattern, max_results)
 
     def _search_with_grep(
         self,
@@ -176,46 +187,79 @@ class GrepTool(Tool):
         ignore_case: bool,
         context_lines: int,
         max_results: int,
+        fixed_strings: bool = False,
     ) -> str:
         """Fall back to grep if ripgrep not available."""
-        cmd = ["grep", "-r", "-n", "--color=never"]
+        grep = _which("grep")
+        if grep is None:
+            raise ToolExecutionError(
+                self.name,
+                "Neither ripgrep (rg) nor grep found. Please install one.",
+            )
+        cmd = [grep, "-r", "-n", "--color=never"]
 
         if ignore_case:
             cmd.append("-i")
 
+        if fixed_strings:
+            cmd.append("-F")
+
         if context_lines > 0:
             cmd.extend(["-C", str(context_lines)])
 
         if include:
             cmd.extend(["--include", include])
 
+        cmd.extend(["--max-count", str(max_results)])
+
         cmd.append(pattern)
         cmd.append(str(path))
 
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
+        return self._run_search(cmd, pattern, max_results)
 
-            output = result.stdout
-            if not output:
-                return f"No matches found for pattern: {pattern}"
+    def _run_search(self, cmd: list[str], pattern: str, max_results: int) -> str:
+        """
+        Run a search command and read at most max_results lines of its output.
 
-            # Truncate if too long
-            lines = output.split("\n")
-            if len(lines) > max_results:
-                lines = lines[:max_results]
-                output = "\n".join(lines) + f"\n\n... (showing first {max_results} results)"
+        The search is killed as soon as one more line arrives, instead of
+        being left to scan the rest of the tree for output that is dropped.
+        """
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
 
-            return output
+        timed_out = threading.Event()
 
-        except subprocess.TimeoutExpired:
+        def kill() -> None:
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(self.SEARCH_TIMEOUT, kill)
+        timer.start()
+        try:
+            # One line past the limit tells whether the output was cut off
+            lines = list(islice(proc.stdout, max_results + 1))
+            truncated = len(lines) > max_results
+            if truncated:
+                proc.kill()
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+            proc.wait()
+
+        if timed_out.is_set():
             raise ToolExecutionError(self.name, "Search timed out")
-        except FileNotFoundError:
-            raise ToolExecutionError(
-                self.name,
-                "Neither ripgrep (rg) nor grep found. Please install one.",
-            )
+
+        if not lines:
+            return f"No matches found for pattern: {pattern}"
+
+        # Lines are read as bytes and only the kept ones are decoded, as
+        # UTF-8 whatever the locale, with the newline handling of text mode
+        output = b"".join(lines[:max_results]).decode("utf-8", errors="replace")
+        if "\r" in output:
+            output = output.replace("\r\n", "\n").replace("\r", "\n")
+        if truncated:
+            output += f"\n... (showing first {max_results} results)"
+        return output
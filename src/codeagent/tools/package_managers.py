@@ -2,14 +2,71 @@
 
 import json
 import os
+import shutil
+import signal
 import subprocess
+import threading
 from pathlib import Path
-from typing import Any, Optional
+from typing import IO, Any, Optional
 
 from codeagent.core.exceptions import ToolExecutionError
 from codeagent.tools.base import Tool, ToolParameter
 
 
+_executables: dict[str, str] = {}
+
+
+def _which(name: str) -> Optional[str]:
+    """Absolute path of a package manager; only successful lookups are cached."""
+    path = _executables.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path is not None:
+            _executables[name] = path
+    return path
+
+
+# Bytes kept from each of a command's output streams
+MAX_OUTPUT_BYTES = 4 << 20
+
+
+def _read_capped(stream: IO[bytes], buffer: bytearray) -> None:
+    """
+    Read a pipe to EOF, keeping at most MAX_OUTPUT_BYTES + 1 bytes of it.
+
+    The rest is read and dropped, so the command never blocks on a full
+    pipe; the one extra byte kept shows that something was dropped.
+    """
+    while True:
+        chunk = stream.read1(65536)
+        if not chunk:
+            break
+        room = MAX_OUTPUT_BYTES + 1 - len(buffer)
+        if room > 0:
+            buffer += chunk[:room]
+
+
+def _decode_output(buffer: bytearray) -> str:
+    """Decode captured output, noting where it was cut off."""
+    text = buffer[:MAX_OUTPUT_BYTES].decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if len(buffer) > MAX_OUTPUT_BYTES:
+        text += f"\n... [output truncated at {MAX_OUTPUT_BYTES >> 20}MB]"
+    return text
+
+
+def _kill_group(proc: subprocess.Popen) -> None:
+    """Kill a process started with start_new_session, and everything in its group."""
+    if os.name != "posix":
+        proc.kill()
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
 def _run_command(
     args: list[str],
     cwd: Optional[str] = None,
@@ -17,24 +74,55 @@ def _run_command(
     env: Optional[dict[str, str]] = None,
 ) -> tuple[str, str, int]:
     """Run a command and return stdout, stderr, returncode."""
+    executable = _which(args[0])
+    if executable is None:
+        raise ToolExecutionError(args[0], f"{args[0]} is not installed or not in PATH")
     try:
-        run_env = {**os.environ}
-        if env:
-            run_env.update(env)
-
-        result = subprocess.run(
-            args,
+        # env=None inherits os.environ as is, without copying it
+        proc = subprocess.Popen(
+            [executable, *args[1:]],
             cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            env=run_env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env={**os.environ, **env} if env else None,
+            # Its own process group, so a timeout also stops what it started
+            # (the server under `npm start`, the binary under `cargo run`),
+            # which would otherwise hold the pipes open
+            start_new_session=True,
         )
-        return result.stdout, result.stderr, result.returncode
     except FileNotFoundError:
         raise ToolExecutionError(args[0], f"{args[0]} is not installed or not in PATH")
-    except subprocess.TimeoutExpired:
+
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        timed_out.set()
+        _kill_group(proc)
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    stdout, stderr = bytearray(), bytearray()
+    stderr_reader = threading.Thread(target=_read_capped, args=(proc.stderr, stderr))
+    try:
+        stderr_reader.start()
+        _read_capped(proc.stdout, stdout)
+        stderr_reader.join()
+        code = proc.wait()
+    finally:
+        timer.cancel()
+        if proc.returncode is None:
+            _kill_group(proc)  # interrupted, e.g. by Ctrl+C
+        proc.stdout.close()
+        proc.stderr.close()
+
+    if timed_out.is_set():
         raise ToolExecutionError(args[0], f"Command timed out after {timeout}s")
+    return _decode_output(stdout), _decode_output(stderr), code
+
+
+def _compact_json(data: Any) -> str:
+    """Serialize data as JSON without any whitespace."""
+    return json.dumps(data, separators=(",", ":"))
 
 
 # =============================================================================
@@ -42,6 +130,25 @@ def _run_command(
 # =============================================================================
 
 
+def _npm_dependencies(dependencies: dict[str, Any]) -> dict[str, Any]:
+    """
+    Reduce an `npm list --json` dependency tree to versions.
+
+    A package maps to its version string, or to a dict that also holds its
+    own dependencies. Missing packages keep their required range instead.
+    """
+    result: dict[str, Any] = {}
+    for name, info in dependencies.items():
+        if info.get("missing"):
+            result[name] = {"required": info.get("required"), "missing": True}
+            continue
+        entry: dict[str, Any] = {"version": info.get("version")}
+        if info.get("dependencies"):
+            entry["dependencies"] = _npm_dependencies(info["dependencies"])
+        result[name] = entry["version"] if len(entry) == 1 else entry
+    return result
+
+
 class NpmInstallTool(Tool):
     """Tool for installing npm packages."""
 
@@ -219,7 +326,7 @@ class NpmListTool(Tool):
     ) -> str:
         """List npm packages."""
         cwd = path or kwargs.get("working_dir", ".")
-        args = ["npm", "list", f"--depth={depth}"]
+        args = ["npm", "list", "--json", f"--depth={depth}"]
 
         if global_list:
             args.append("-g")
@@ -230,13 +337,30 @@ class NpmListTool(Tool):
         output = stdout.strip()
         if not output:
             return "No packages installed"
-        return output
+        try:
+            tree = json.loads(output)
+        except ValueError:
+            return output
+        if "error" in tree:
+            return _compact_json(tree)
+        if not tree.get("dependencies") and not tree.get("problems"):
+            return "No packages installed"
+
+        result: dict[str, Any] = {"name": tree.get("name"), "version": tree.get("version")}
+        result["dependencies"] = _npm_dependencies(tree.get("dependencies", {}))
+        if tree.get("problems"):
+            result["problems"] = tree["problems"]
+        return _compact_json(result)
 
 
 # =============================================================================
 # Pip Tools
 # =============================================================================
 
+# pip's check for a newer pip is a PyPI request on every install and list,
+# and a prompt would hang with no one to answer it
+_PIP_OPTIONS = ["--disable-pip-version-check", "--no-input"]
+
 
 class PipInstallTool(Tool):
     """Tool for installing Python packages with pip."""
@@ -285,7 +409,7 @@ class PipInstallTool(Tool):
     ) -> str:
         """Install pip packages."""
         cwd = path or kwargs.get("working_dir", ".")
-        args = ["pip", "install"]
+        args = ["pip", "install", *_PIP_OPTIONS]
 
         if upgrade:
             args.append("--upgrade")
@@ -341,7 +465,7 @@ class PipListTool(Tool):
     ) -> str:
         """List pip packages."""
         cwd = path or kwargs.get("working_dir", ".")
-        args = ["pip", "list"]
+        args = ["pip", "list", "--format=json", *_PIP_OPTIONS]
 
         if outdated:
             args.append("--outdated")
@@ -351,7 +475,19 @@ class PipListTool(Tool):
         if code != 0:
             raise ToolExecutionError(self.name, stderr.strip())
 
-        return stdout.strip() or "No packages installed"
+        output = stdout.strip()
+        try:
+            listing = json.loads(output or "[]")
+        except ValueError:
+            return output  # not JSON, or cut off at MAX_OUTPUT_BYTES
+
+        # Keyed by name; packages with more than a version keep all fields
+        packages = {}
+        for package in listing:
+            info = {key: value for key, value in package.items() if key != "name"}
+            packages[package["name"]] = info["version"] if len(info) == 1 else info
+
+        return _compact_json(packages) if packages else "No packages installed"
 
 
 class PipFreezeTool(Tool):
@@ -423,7 +559,7 @@ class PipUninstallTool(Tool):
     ) -> str:
         """Uninstall pip packages."""
         cwd = path or kwargs.get("working_dir", ".")
-        args = ["pip", "uninstall", "-y"] + packages.split()
+        args = ["pip", "uninstall", "-y", *_PIP_OPTIONS] + packages.split()
 
         stdout, stderr, code = _run_command(args, cwd=cwd)
 
@@ -1,22 +1,105 @@
 """Web fetching and HTTP tools."""
 
+import atexit
 import json
 import re
-from typing import Any
+import threading
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Optional
 from urllib.parse import urlparse
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # optional, see the "speedups" extra
+    orjson = None
+
 from codeagent.core.exceptions import ToolExecutionError
 from codeagent.tools.base import Tool, ToolParameter
 
+# Patterns used by WebFetchTool._strip_html_tags
+_RE_SCRIPT = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+_RE_STYLE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_RE_BR = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_RE_BLOCK_CLOSE = re.compile(r'</(p|div|h[1-6]|li|tr)>', re.IGNORECASE)
+_RE_BLOCK_OPEN = re.compile(r'<(p|div|h[1-6]|li|tr)[^>]*>', re.IGNORECASE)
+_RE_TAG = re.compile(r'<[^>]+>')
+_RE_BLANK_LINES = re.compile(r'\n\s*\n')
+_RE_SPACES = re.compile(r' +')
+
+# Digit runs too long for orjson to read exactly, see _pretty_json
+_RE_LONG_NUMBER = re.compile(r'\d{20}')
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def _http_client() -> httpx.Client:
+    """
+    Client shared by the web tools, created on first use.
+
+    Requests to a host it has already talked to reuse the open connection,
+    skipping the TCP and TLS handshakes. Its cookie jar accepts nothing, so
+    each request still starts without cookies as with a fresh client.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    follow_redirects=True,
+                    cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+                    limits=httpx.Limits(max_keepalive_connections=32),
+                )
+                atexit.register(_client.close)
+    return _client
+
+
+def _pretty_json(text: str) -> str:
+    """
+    Re-indent a JSON document. Raises json.JSONDecodeError if it does not parse.
+
+    orjson is used when installed. Documents it rejects, such as ones with
+    NaN, go through the json module instead. So do ones with 20 or more
+    digits in a row, since orjson reads integers beyond 64 bits as floats.
+    """
+    if orjson is not None and not _RE_LONG_NUMBER.search(text):
+        try:
+            return orjson.dumps(orjson.loads(text), option=orjson.OPT_INDENT_2).decode()
+        except orjson.JSONDecodeError:
+            pass
+    return json.dumps(json.loads(text), indent=2, ensure_ascii=False)
+
+
+def _read_body(response: httpx.Response, limit: int) -> tuple[str, bool]:
+    """
+    Text of a streamed response, reading at most limit bytes of its body.
+
+    Returns the text and whether the body went on past the limit; the rest
+    is never downloaded.
+    """
+    body = bytearray()
+    for chunk in response.iter_bytes():
+        body += chunk
+        if len(body) > limit:
+            break
+    text = body[:limit].decode(response.encoding or "utf-8", errors="replace")
+    return text, len(body) > limit
+
 
 class WebFetchTool(Tool):
     """Tool for fetching content from URLs."""
 
+    read_only = True
+
     # Maximum content size to return (in characters)
     MAX_CONTENT_SIZE = 50000
 
+    # Body bytes downloaded at most; well above MAX_CONTENT_SIZE, since
+    # stripping HTML markup usually leaves a fraction of the page
+    MAX_DOWNLOAD_BYTES = 1 << 20
+
     # Request timeout in seconds
     DEFAULT_TIMEOUT = 30
 
@@ -60,28 +143,29 @@ class WebFetchTool(Tool):
     def _strip_html_tags(self, html: str) -> str:
         """Convert HTML to readable plain text."""
         # Remove script and style elements
-        html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-        html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
+        html = _RE_SCRIPT.sub('', html)
+        html = _RE_STYLE.sub('', html)
 
         # Convert common block elements to newlines
-        html = re.sub(r'<br\s*/?>', '\n', html, flags=re.IGNORECASE)
-        html = re.sub(r'</(p|div|h[1-6]|li|tr)>', '\n', html, flags=re.IGNORECASE)
-        html = re.sub(r'<(p|div|h[1-6]|li|tr)[^>]*>', '\n', html, flags=re.IGNORECASE)
+        html = _RE_BR.sub('\n', html)
+        html = _RE_BLOCK_CLOSE.sub('\n', html)
+        html = _RE_BLOCK_OPEN.sub('\n', html)
 
         # Remove all remaining HTML tags
-        html = re.sub(r'<[^>]+>', '', html)
+        html = _RE_TAG.sub('', html)
 
         # Decode common HTML entities
-        html = html.replace('&nbsp;', ' ')
-        html = html.replace('&lt;', '<')
-        html = html.replace('&gt;', '>')
-        html = html.replace('&amp;', '&')
-        html = html.replace('&quot;', '"')
-        html = html.replace('&#39;', "'")
+        if '&' in html:
+            html = html.replace('&nbsp;', ' ')
+            html = html.replace('&lt;', '<')
+            html = html.replace('&gt;', '>')
+            html = html.replace('&amp;', '&')
+            html = html.replace('&quot;', '"')
+            html = html.replace('&#39;', "'")
 
         # Clean up whitespace
-        html = re.sub(r'\n\s*\n', '\n\n', html)
-        html = re.sub(r' +', ' ', html)
+        html = _RE_BLANK_LINES.sub('\n\n', html)
+        html = _RE_SPACES.sub(' ', html)
 
         return html.strip()
 
@@ -123,32 +207,32 @@ class WebFetchTool(Tool):
         effective_timeout = min(timeout or self._timeout, 120)
 
         try:
-            with httpx.Client(
-                timeout=effective_timeout,
-                follow_redirects=True,
+            with _http_client().stream(
+                "GET",
+                url,
                 headers={"User-Agent": self.USER_AGENT},
-            ) as client:
-                response = client.get(url)
+                timeout=effective_timeout,
+            ) as response:
                 response.raise_for_status()
+                content, cut = _read_body(response, self.MAX_DOWNLOAD_BYTES)
 
-                content_type = response.headers.get('content-type', '')
-                content = response.text
+            content_type = response.headers.get('content-type', '')
 
-                # Format based on content type
-                if self._is_json_response(content_type):
+            # Format based on content type; JSON cut off mid-way cannot be parsed
+            if self._is_json_response(content_type):
+                if not cut:
                     try:
-                        data = response.json()
-                        content = json.dumps(data, indent=2)
+                        content = _pretty_json(content)
                     except json.JSONDecodeError:
                         pass  # Keep as raw text
-                elif self._is_html_response(content_type):
-                    content = self._strip_html_tags(content)
+            elif self._is_html_response(content_type):
+                content = self._strip_html_tags(content)
 
-                # Truncate if too large
-                if len(content) > self.MAX_CONTENT_SIZE:
-                    content = content[:self.MAX_CONTENT_SIZE] + "\n\n... (content truncated)"
+            # Truncate if too large
+            if cut or len(content) > self.MAX_CONTENT_SIZE:
+                content = content[:self.MAX_CONTENT_SIZE] + "\n\n... (content truncated)"
 
-                return f"URL: {url}\nStatus: {response.status_code}\n\n{content}"
+            return f"URL: {url}\nStatus: {response.status_code}\n\n{content}"
 
         except httpx.TimeoutException:
             raise ToolExecutionError(
@@ -172,6 +256,7 @@ class HttpRequestTool(Tool):
 
     DEFAULT_TIMEOUT = 30
     MAX_BODY_SIZE = 50000
+    MAX_DOWNLOAD_BYTES = 1 << 20
 
     def __init__(self, timeout: int = DEFAULT_TIMEOUT) -> None:
         """Initialize the HTTP request tool."""
@@ -281,48 +366,45 @@ class HttpRequestTool(Tool):
                 content = body
 
         try:
-            with httpx.Client(
+            with _http_client().stream(
+                method,
+                url,
+                headers=request_headers,
+                json=json_data,
+                content=content,
                 timeout=effective_timeout,
-                follow_redirects=True,
-            ) as client:
-                response = client.request(
-                    method=method,
-                    url=url,
-                    headers=request_headers,
-                    json=json_data,
-                    content=content,
-                )
+            ) as response:
+                body_text, cut = _read_body(response, self.MAX_DOWNLOAD_BYTES)
 
-                # Format response
-                result_parts = [
-                    f"Status: {response.status_code} {response.reason_phrase}",
-                    f"URL: {response.url}",
-                    "",
-                    "Response Headers:",
-                ]
+            # Format response
+            result_parts = [
+                f"Status: {response.status_code} {response.reason_phrase}",
+                f"URL: {response.url}",
+                "",
+                "Response Headers:",
+            ]
 
-                for key, value in response.headers.items():
-                    result_parts.append(f"  {key}: {value}")
+            for key, value in response.headers.items():
+                result_parts.append(f"  {key}: {value}")
 
-                result_parts.append("")
-                result_parts.append("Response Body:")
+            result_parts.append("")
+            result_parts.append("Response Body:")
 
-                # Try to format JSON responses
-                content_type = response.headers.get('content-type', '')
-                body_text = response.text
+            # Try to format JSON responses
+            content_type = response.headers.get('content-type', '')
 
-                if 'application/json' in content_type:
-                    try:
-                        body_text = json.dumps(response.json(), indent=2)
-                    except json.JSONDecodeError:
-                        pass
+            if 'application/json' in content_type and not cut:
+                try:
+                    body_text = _pretty_json(body_text)
+                except json.JSONDecodeError:
+                    pass
 
-                if len(body_text) > self.MAX_BODY_SIZE:
-                    body_text = body_text[:self.MAX_BODY_SIZE] + "\n\n... (body truncated)"
+            if cut or len(body_text) > self.MAX_BODY_SIZE:
+                body_text = body_text[:self.MAX_BODY_SIZE] + "\n\n... (body truncated)"
 
-                result_parts.append(body_text if body_text else "(empty body)")
+            result_parts.append(body_text if body_text else "(empty body)")
 
-                return "\n".join(result_parts)
+            return "\n".join(result_parts)
 
         except httpx.TimeoutException:
             raise ToolExecutionError(
@@ -307,7 +307,7 @@ class Console:
             path = self._shorten_path(path)
             return yellow, f"{bold}Write{reset}({dim}{path}{reset})"
 
-        elif tool_name == "edit_file":
+        elif tool_name in ("edit_file", "batch_edit"):
             path = args.get("file_path", "")
             path = self._shorten_path(path)
             return yellow, f"{bold}Update{reset}({dim}{path}{reset})"
@@ -0,0 +1,44 @@
+"""Tests for the agent loop."""
+
+import threading
+from typing import Any
+
+from codeagent.core.agent import Agent
+from codeagent.core.types import ToolCall
+from codeagent.tools.base import Tool, ToolRegistry
+
+
+class EchoTool(Tool):
+    read_only = True
+
+    @property
+    def name(self) -> str:
+        return "echo"
+
+    @property
+    def description(self) -> str:
+        return "Return the text it is given."
+
+    def execute(self, text: str = "", **kwargs: Any) -> str:
+        return text
+
+
+def _tool_threads() -> list[threading.Thread]:
+    return [t for t in threading.enumerate() if t.name.startswith("tool")]
+
+
+def test_read_only_batch_keeps_order_and_leaves_no_threads(tmp_path):
+    registry = ToolRegistry()
+    registry.register(EchoTool())
+    agent = Agent(provider=None, tools=registry, working_dir=str(tmp_path))
+    calls = [ToolCall(id=str(i), name="echo", arguments={"text": f"t{i}"}) for i in range(4)]
+
+    results = list(agent._execute_tools(calls))
+
+    assert [(call.id, result.content) for call, result in results] == [
+        ("0", "t0"),
+        ("1", "t1"),
+        ("2", "t2"),
+        ("3", "t3"),
+    ]
+    assert _tool_threads() == []
@@ -0,0 +1,44 @@
+"""Tests for the code analysis tools."""
+
+import pytest
+
+from codeagent.tools import code_analysis
+from codeagent.tools.code_analysis import FindSymbolTool
+from codeagent.tools.file_write import WriteFileTool
+
+
+@pytest.fixture(autouse=True)
+def empty_find_cache():
+    code_analysis._FIND_CACHE.clear()
+    yield
+    code_analysis._FIND_CACHE.clear()
+
+
+def test_find_symbol_repeat_call_hits_cache(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("def alpha():\n    pass\n")
+    tool = FindSymbolTool()
+
+    first = tool.safe_execute("1", symbol="alpha", path=str(tmp_path))
+    assert not first.is_error
+    assert "pkg/a.py:1" in first.content
+    assert len(code_analysis._FIND_CACHE) == 1
+
+    # Changes in a subdirectory leave the root mtime alone, so only a cache
+    # hit can still return the first result
+    (tmp_path / "pkg" / "b.py").write_text("def alpha():\n    pass\n")
+    second = tool.safe_execute("2", symbol="alpha", path=str(tmp_path))
+    assert second.content == first.content
+
+
+def test_find_symbol_cache_cleared_by_writing_tool(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("def alpha():\n    pass\n")
+    tool = FindSymbolTool()
+    tool.safe_execute("1", symbol="beta", path=str(tmp_path))
+
+    WriteFileTool().safe_execute(
+        "2", file_path=str(tmp_path / "pkg" / "b.py"), content="def beta():\n    pass\n"
+    )
+    result = tool.safe_execute("3", symbol="beta", path=str(tmp_path))
+    assert "pkg/b.py:1" in result.content
@@ -0,0 +1,17 @@
+"""Tests for the git tools."""
+
+import sys
+
+from codeagent.tools import git
+
+
+def test_run_git_capped_drains_stderr(monkeypatch):
+    # 1MB of warnings before any output would fill the stderr pipe and block
+    # the command if stderr were only read after stdout
+    script = "import sys; sys.stderr.write('w' * (1 << 20)); sys.stdout.write('diff')"
+    monkeypatch.setattr(git, "_git_command", lambda args, cwd: [sys.executable, "-c", script])
+
+    stdout, stderr, code, truncated = git._run_git_capped(["diff"], None, 1000, timeout=10)
+
+    assert (stdout, code, truncated) == (b"diff", 0, False)
+    assert len(stderr) == git._STDERR_CAP
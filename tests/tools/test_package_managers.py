@@ -0,0 +1,24 @@
+"""Tests for the package manager tools."""
+
+import os
+import time
+
+import pytest
+
+from codeagent.core.exceptions import ToolExecutionError
+from codeagent.tools.package_managers import _run_command
+
+
+def test_run_command_returns_output():
+    stdout, stderr, code = _run_command(["sh", "-c", "echo out; echo err >&2; exit 3"])
+    assert (stdout, stderr, code) == ("out\n", "err\n", 3)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX only")
+def test_run_command_timeout_kills_background_children():
+    # The background sleep inherits the pipes; killing only sh would leave
+    # the readers waiting for it
+    start = time.monotonic()
+    with pytest.raises(ToolExecutionError, match="timed out after 1s"):
+        _run_command(["sh", "-c", "echo start; sleep 30 & sleep 30"], timeout=1)
+    assert time.monotonic() - start < 10